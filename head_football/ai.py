@@ -5,11 +5,20 @@ import random
 import pygame
 from player import Player
 from config import SCREEN_WIDTH
+import telemetry
 
 class AIOpponent(Player):
-    def __init__(self, x, y, profile, difficulty):
+    __slots__ = ("difficulty", "rng", "reaction_time", "accuracy", "speed_factor", "jump_probability",
+                 "target_x", "decision_timer", "last_ball_pos", "decided_jump", "decided_head", "command")
+    
+    # Player.STATE plus the decision state
+    STATE = Player.STATE + ("target_x", "decision_timer", "last_ball_pos")
+    
+    def __init__(self, x, y, profile, difficulty, rng=None):
         super().__init__(x, y, profile, is_player=False)
         self.difficulty = difficulty
+        # Random stream for decisions (shared with the rest of the match)
+        self.rng = rng if rng is not None else random.Random()
         self.reaction_time = difficulty["reaction_time"] * 60  # convert to frames
         self.accuracy = difficulty["accuracy"]
         self.speed_factor = difficulty["speed_factor"]
@@ -23,12 +32,13 @@ class AIOpponent(Player):
         self.decision_timer = 0
         self.last_ball_pos = None
         
-        # Debug info
-        print(f"AI initialized with difficulty: {self.difficulty}")
-        print(f"Reaction time: {self.reaction_time/60} seconds")
-        print(f"Accuracy: {self.accuracy}")
-        print(f"Speed factor: {self.speed_factor}")
-        print(f"Jump probability: {self.jump_probability}")
+        # What the AI decided during the latest update (recorded in replays)
+        self.decided_jump = False
+        self.decided_head = False
+        
+        # An InputState set by a planner (see search.py) replaces the reactive
+        # decisions below while it isn't None
+        self.command = None
         
     def decide_action(self, ball):
         """Decide what action to take based on ball position"""
@@ -41,15 +51,15 @@ class AIOpponent(Player):
         current_ball_pos = (ball.x, ball.y)
         
         # Reset decision timer
-        self.decision_timer = int(self.reaction_time * random.uniform(0.8, 1.2))
+        self.decision_timer = int(self.reaction_time * self.rng.uniform(0.8, 1.2))
         
         # Calculate where to move
         ball_x = ball.x
         
         # Add inaccuracy based on difficulty
-        if random.random() > self.accuracy:
+        if self.rng.random() > self.accuracy:
             # Add random offset to target position
-            ball_x += random.randint(-100, 100)
+            ball_x += self.rng.randint(-100, 100)
             
         # Constrain to screen bounds
         ball_x = max(0, min(ball_x, SCREEN_WIDTH - self.width))
@@ -60,31 +70,80 @@ class AIOpponent(Player):
         # Decide whether to jump
         if (ball.y < self.y and  # Ball is above AI
             abs(ball.x - self.x) < 100 and  # Ball is close horizontally
-            random.random() < self.jump_probability):  # Random chance based on difficulty
+            self.rng.random() < self.jump_probability):  # Random chance based on difficulty
             self.jump()
-            print("AI decided to jump")
+            self.decided_jump = True
+            if telemetry.level >= telemetry.DEBUG:
+                telemetry.record(telemetry.JUMP, "ai")
             
         # Decide whether to head
         if (abs(ball.x - (self.x + self.width/2)) < 50 and  # Ball is close horizontally
             abs(ball.y - (self.y + 15)) < 50 and  # Ball is close to head
-            random.random() < self.accuracy):  # Random chance based on difficulty
+            self.rng.random() < self.accuracy):  # Random chance based on difficulty
             if self.head():
-                print("AI attempting to head the ball")
+                self.decided_head = True
             
         # Update last ball position
         self.last_ball_pos = current_ball_pos
         
-    def update(self, ball):
-        # Decide action based on ball position
-        self.decide_action(ball)
+    def copy_settings(self, other, rng=None):
+        """Copy everything that isn't STATE from other, drawing decisions from rng"""
+        super().copy_settings(other)
+        self.difficulty, self.reaction_time, self.accuracy = (
+            other.difficulty, other.reaction_time, other.accuracy)
+        self.speed_factor, self.jump_probability = other.speed_factor, other.jump_probability
+        self.copy_decisions(other)
+        self.rng = rng if rng is not None else other.rng
         
-        # Move towards target position
-        if self.x + self.width/2 < self.target_x - 10:
-            self.move_right()
-        elif self.x + self.width/2 > self.target_x + 10:
+    def copy_decisions(self, other):
+        """Copy the latest decisions and planner command, which aren't in STATE"""
+        self.decided_jump, self.decided_head = other.decided_jump, other.decided_head
+        self.command = other.command
+        
+    def follow(self, command):
+        """Carry out a planner's InputState for this tick"""
+        if command.left:
             self.move_left()
+        elif command.right:
+            self.move_right()
         else:
             self.stop()
+        if command.jump:
+            self.jump()
+            self.decided_jump = True
+        if command.head and self.head():
+            self.decided_head = True
+        
+    def snapshot(self):
+        """Return the physics and decision state (the STATE fields) as a tuple (see restore)"""
+        return (self.x, self.y, self.vel_x, self.vel_y, self.is_jumping, self.is_heading,
+                self.heading_cooldown, self.heading_frames, self.is_celebrating,
+                self.celebration_frames, self.celebration_jump_count, self.prev_x, self.prev_y,
+                self.target_x, self.decision_timer, self.last_ball_pos)
+        
+    def restore(self, state):
+        """Restore state captured by snapshot"""
+        (self.x, self.y, self.vel_x, self.vel_y, self.is_jumping, self.is_heading,
+         self.heading_cooldown, self.heading_frames, self.is_celebrating,
+         self.celebration_frames, self.celebration_jump_count, self.prev_x, self.prev_y,
+         self.target_x, self.decision_timer, self.last_ball_pos) = state
+        
+    def update(self, ball):
+        # Decide action based on ball position
+        self.decided_jump = False
+        self.decided_head = False
+        if self.command is not None:
+            self.follow(self.command)
+        else:
+            self.decide_action(ball)
+            
+            # Move towards target position
+            if self.x + self.width/2 < self.target_x - 10:
+                self.move_right()
+            elif self.x + self.width/2 > self.target_x + 10:
+                self.move_left()
+            else:
+                self.stop()
             
         # Call parent update method
         super().update()
@@ -0,0 +1,412 @@
+"""
+Shared image assets for the Head Football game.
+
+Each image file is decoded once per process, and scaled variants are cached
+by (path, size). When a display exists, surfaces are converted to its pixel
+format so blitting them doesn't convert every pixel on every frame. The same
+surface is handed to every caller, so callers must not draw on it.
+
+If a texture atlas built by build_atlas.py is present, variants packed into
+it are returned as subsurfaces of one memory-mapped image instead, so no PNG
+has to be decoded. Entries whose source file changed since the atlas was
+built are ignored and loaded from the PNG as usual.
+
+Scaled variants that aren't in the atlas are kept in an on-disk cache as raw
+RGBA pixels, named after the source file's content hash, the target size and
+the scaling algorithm, so later launches skip decoding and scaling. When a
+source image is regenerated its hash changes, so the old entry is simply
+never asked for again (and is deleted when the new one is written).
+
+Atlas file layout (little endian):
+    b"HFAT", u8 version, 3 pad bytes, u32 width, u32 height, u32 index length
+    JSON index: [[path, w, h, x, y, source mtime_ns, source bytes], ...]
+    RGBA pixels (width * height * 4 bytes) at the next 16-byte boundary
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from config import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, GOAL_WIDTH, GOAL_HEIGHT, PLAYER_PROFILES, PLAYERS_DIR,
+    BACKGROUND_DIR, PLAYER_SPRITE_SIZE, HEAD_SPRITE_SIZE, PREVIEW_SIZE, ATLAS_FILE,
+    DERIVED_CACHE_DIR
+)
+
+ATLAS_MAGIC = b"HFAT"
+ATLAS_VERSION = 1
+ATLAS_HEADER = struct.Struct("<4sB3xIII")
+
+
+# Scaling algorithms a derived image can be made with (part of the cache key)
+SCALERS = {
+    "scale": pygame.transform.scale,
+    "smoothscale": pygame.transform.smoothscale,
+}
+
+
+def background_images():
+    """(path, size) of the stadium, field and goal images used in a match"""
+    return [
+        (BACKGROUND_DIR + "stadium.png", (SCREEN_WIDTH, SCREEN_HEIGHT)),
+        (BACKGROUND_DIR + "field.png", (SCREEN_WIDTH, 200)),
+        (BACKGROUND_DIR + "goal_left.png", (GOAL_WIDTH, GOAL_HEIGHT)),
+        (BACKGROUND_DIR + "goal_right.png", (GOAL_WIDTH, GOAL_HEIGHT)),
+    ]
+
+
+def player_images(profile):
+    """(path, size) of a profile's sprite, preview and head, if it has a sprite"""
+    sprite_name = profile.get("sprite")
+    if not sprite_name:
+        return []
+    sprite_path = os.path.join(PLAYERS_DIR, f"{sprite_name}.png")
+    head_path = os.path.join(PLAYERS_DIR, f"{sprite_name}_head.png")
+    return [(sprite_path, PLAYER_SPRITE_SIZE), (sprite_path, PREVIEW_SIZE), (head_path, HEAD_SPRITE_SIZE)]
+
+
+def game_images():
+    """Every (path, size) the game asks the asset manager for, if the file exists"""
+    images = background_images()
+    for profile in PLAYER_PROFILES.values():
+        images += player_images(profile)
+    return [(path, size) for path, size in images if os.path.exists(path)]
+
+
+def pixel_offset(index_length):
+    """Where the pixel data starts in an atlas file"""
+    return (ATLAS_HEADER.size + index_length + 15) // 16 * 16
+
+
+def source_stamp(path):
+    """What identifies the version of a source file: (mtime in ns, size)"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Atlas:
+    """A memory-mapped texture atlas and the rectangles of its entries"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, width, height, index_length = ATLAS_HEADER.unpack_from(self.map, 0)
+        if magic != ATLAS_MAGIC or version != ATLAS_VERSION:
+            raise ValueError(f"{path} is not a version {ATLAS_VERSION} atlas")
+        index = json.loads(self.map[ATLAS_HEADER.size:ATLAS_HEADER.size + index_length])
+
+        # The surface uses the mapped pixels directly; nothing is decoded
+        offset = pixel_offset(index_length)
+        self.pixels = memoryview(self.map)[offset:offset + width * height * 4]
+        self.surface = pygame.image.frombuffer(self.pixels, (width, height), "RGBA")
+        self.converted = False
+
+        self.entries = {}
+        for entry_path, w, h, x, y, mtime_ns, size in index:
+            self.entries[(entry_path, (w, h))] = (pygame.Rect(x, y, w, h), (mtime_ns, size))
+        self.fresh = {}
+
+    def get(self, path, size):
+        """Subsurface for (path, size), or None if not packed or out of date"""
+        entry = self.entries.get((path, size))
+        if entry is None:
+            return None
+        if path not in self.fresh:
+            try:
+                self.fresh[path] = source_stamp(path) == entry[1]
+            except OSError:
+                self.fresh[path] = True  # packed image still usable without its source
+        if not self.fresh[path]:
+            return None
+
+        if not self.converted and pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+            self.converted = True
+        return self.surface.subsurface(entry[0])
+
+
+class DerivedCache:
+    """Scaled images stored on disk as raw RGBA, keyed by source content"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.hashes = {}
+        self.hits = 0
+        self.misses = 0
+        # Loader threads use the cache too; lock guards hashes and the counters
+        self.lock = threading.Lock()
+
+    def source_hash(self, path):
+        with self.lock:
+            digest = self.hashes.get(path)
+        if digest is None:
+            with open(path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()[:16]
+            with self.lock:
+                self.hashes[path] = digest
+        return digest
+
+    def count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def prefix(self, path, size, algorithm):
+        name = os.path.splitext(os.path.relpath(path))[0].replace(os.sep, "_").replace("/", "_")
+        return f"{name}_{size[0]}x{size[1]}_{algorithm}_"
+
+    def filename(self, path, size, algorithm):
+        prefix = self.prefix(path, size, algorithm)
+        return os.path.join(self.directory, prefix + self.source_hash(path) + ".rgba")
+
+    def load(self, path, size, algorithm):
+        """The cached image, or None if there is no valid entry"""
+        try:
+            filename = self.filename(path, size, algorithm)
+            with open(filename, "rb") as f:
+                pixels = f.read()
+        except OSError:
+            self.count(hit=False)
+            return None
+        if len(pixels) != size[0] * size[1] * 4:
+            self.count(hit=False)
+            return None
+        self.count(hit=True)
+        return pygame.image.frombytes(pixels, size, "RGBA")
+
+    def save(self, path, size, algorithm, surface):
+        """Store a derived image, replacing entries made from older sources"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            filename = self.filename(path, size, algorithm)
+            prefix = self.prefix(path, size, algorithm)
+            for old in os.listdir(self.directory):
+                # Another thread may be writing a .tmp file for this prefix
+                if old.startswith(prefix) and old.endswith(".rgba") and old != os.path.basename(filename):
+                    os.remove(os.path.join(self.directory, old))
+            # Write then rename, so a crash never leaves a truncated entry
+            temp = f"{filename}.{threading.get_ident()}.tmp"
+            with open(temp, "wb") as f:
+                f.write(pygame.image.tobytes(surface, "RGBA"))
+            os.replace(temp, filename)
+        except OSError as e:
+            print(f"Could not cache {path}: {e}")
+
+
+class AssetManager:
+    def __init__(self, atlas_path=None, cache_dir=None):
+        self.sources = {}   # path -> decoded image (None if missing or unreadable)
+        self.surfaces = {}  # (path, size, algorithm) -> display-ready surface
+        self.atlas_path = atlas_path
+        self.atlas = None
+        self.atlas_checked = False
+        self.derived = DerivedCache(cache_dir) if cache_dir else None
+
+        # AssetLoader threads load images while the main thread may ask for
+        # the same ones: lock guards sources, and each path has its own lock
+        # held while it is decoded and scaled, so a file is never decoded twice
+        self.lock = threading.Lock()
+        self.path_locks = {}
+
+    def open_atlas(self):
+        """Map the atlas file on first use, if there is one"""
+        self.atlas_checked = True
+        if self.atlas_path and os.path.exists(self.atlas_path):
+            try:
+                self.atlas = Atlas(self.atlas_path)
+            except (OSError, ValueError, pygame.error) as e:
+                print(f"Ignoring texture atlas: {e}")
+        return self.atlas
+
+    def path_lock(self, path):
+        """Lock held while the image at path is being loaded"""
+        with self.lock:
+            return self.path_locks.setdefault(path, threading.RLock())
+
+    def load(self, path):
+        """Decode an image file once; None if it doesn't exist or can't be read"""
+        with self.path_lock(path):
+            with self.lock:
+                if path in self.sources:
+                    return self.sources[path]
+            image = None
+            if os.path.exists(path):
+                try:
+                    image = pygame.image.load(path)
+                except pygame.error:
+                    print(f"Could not load image: {path}")
+            with self.lock:
+                self.sources[path] = image
+            return image
+
+    def get(self, path, size=None, algorithm="scale"):
+        """Return the image at path, scaled to size (w, h) if given"""
+        size = tuple(size) if size else None
+        key = (path, size, algorithm)
+        if key in self.surfaces:
+            return self.surfaces[key]
+        surface = self.from_atlas(path, size, algorithm)
+        if surface is not None:
+            return surface
+        return self.finish(path, size, algorithm, self.scaled(path, size, algorithm))
+
+    def from_atlas(self, path, size, algorithm="scale"):
+        """Store and return the atlas subsurface for an image, if it has one"""
+        # The atlas is built with the default scaler
+        atlas = self.atlas if self.atlas_checked else self.open_atlas()
+        if not atlas or not size or algorithm != "scale":
+            return None
+        surface = atlas.get(path, size)
+        if surface is not None:
+            self.surfaces[(path, size, algorithm)] = surface
+        return surface
+
+    def finish(self, path, size, algorithm, surface):
+        """Convert a loaded image for the display and store it (main thread only)"""
+        # convert_alpha needs a display mode; headless matches skip it
+        if surface is not None and pygame.display.get_surface() is not None:
+            converted = surface.convert_alpha()
+            with self.lock:
+                if surface is self.sources.get(path):
+                    # Same pixels, so keep only the converted copy
+                    self.sources[path] = converted
+            surface = converted
+        self.surfaces[(path, size, algorithm)] = surface
+        return surface
+
+    def preload(self, images, workers=4):
+        """Start loading (path, size) images in the background; see AssetLoader"""
+        return AssetLoader(self, images, workers)
+
+    def scaled(self, path, size, algorithm):
+        """The image at path scaled to size, from the derived cache if possible.
+
+        Safe to call from loader threads: it only touches shared state under
+        the locks, and the result is stored by finish() on the main thread.
+        """
+        with self.path_lock(path):
+            if size and self.derived and os.path.exists(path):
+                surface = self.derived.load(path, size, algorithm)
+                if surface is not None:
+                    return surface
+
+            surface = self.load(path)
+            if surface is None or not size or surface.get_size() == size:
+                return surface
+            surface = SCALERS[algorithm](surface, size)
+            if self.derived:
+                self.derived.save(path, size, algorithm, surface)
+            return surface
+
+    def clear(self):
+        with self.lock:
+            self.sources.clear()
+        self.surfaces.clear()
+        self.atlas = None
+        self.atlas_checked = False
+
+    def memory_report(self):
+        """Bytes of pixel data held per cached surface, largest first"""
+        rows = []
+        if self.atlas:
+            surface = self.atlas.surface
+            rows.append({"kind": "atlas", "path": self.atlas_path, "size": surface.get_size(),
+                         "bytes": surface.get_pitch() * surface.get_height()})
+        with self.lock:
+            sources = dict(self.sources)
+        for kind, cache in (("source", sources), ("scaled", self.surfaces)):
+            for key, surface in cache.items():
+                if surface is None or surface.get_parent() is not None:
+                    continue  # missing, or shares the atlas pixels
+                path = key[0] if kind == "scaled" else key
+                if kind == "scaled" and surface is sources.get(path):
+                    continue  # not a separate copy
+                rows.append({
+                    "kind": kind,
+                    "path": path,
+                    "size": surface.get_size(),
+                    "bytes": surface.get_pitch() * surface.get_height(),
+                })
+        rows.sort(key=lambda row: -row["bytes"])
+        return rows
+
+    def format_memory_report(self):
+        rows = self.memory_report()
+        lines = [f"{'Kind':<7} {'Size':>10} {'KiB':>8}  Path"]
+        for row in rows:
+            width, height = row["size"]
+            lines.append(f"{row['kind']:<7} {f'{width}x{height}':>10} {row['bytes'] / 1024:>8.1f}  {row['path']}")
+        total = sum(row["bytes"] for row in rows)
+        lines.append(f"{len(rows)} surfaces, {total / 1024:.1f} KiB total")
+        return "\n".join(lines)
+
+
+class AssetLoader:
+    """Loads images on worker threads while the game keeps drawing frames.
+
+    Decoding and scaling run on a thread pool (SDL_image releases the GIL
+    while decoding); conversion to the display format has to happen on the
+    main thread, so call poll() once per frame to finish whatever is ready.
+    Images asked for with AssetManager.get() in the meantime are simply
+    loaded right away, waiting for a worker that is loading the same file.
+    The workers only run AssetManager.scaled; completed and pending belong
+    to the thread that calls poll().
+    """
+    def __init__(self, manager, images, workers=4):
+        self.manager = manager
+        self.total = len(images)
+        self.completed = 0
+        self.pending = []
+        self.executor = None
+
+        for path, size in images:
+            size = tuple(size)
+            if (path, size, "scale") in manager.surfaces or manager.from_atlas(path, size) is not None:
+                self.completed += 1
+                continue
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+            self.pending.append((path, size, self.executor.submit(manager.scaled, path, size, "scale")))
+        self.shutdown_if_done()
+
+    @property
+    def done(self):
+        return not self.pending
+
+    @property
+    def progress(self):
+        """Fraction of the images that are ready, from 0.0 to 1.0"""
+        return self.completed / self.total if self.total else 1.0
+
+    def poll(self):
+        """Convert and store the images that finished loading; True when all are done"""
+        still_loading = []
+        for path, size, future in self.pending:
+            if not future.done():
+                still_loading.append((path, size, future))
+                continue
+            # Something may have asked for it directly while it was loading
+            if (path, size, "scale") not in self.manager.surfaces:
+                self.manager.finish(path, size, "scale", future.result())
+            self.completed += 1
+        self.pending = still_loading
+        self.shutdown_if_done()
+        return self.done
+
+    def wait(self):
+        """Block until every image is loaded"""
+        for _, _, future in self.pending:
+            future.result()
+        self.poll()
+
+    def shutdown_if_done(self):
+        if self.done and self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+# Shared by every game object in the process
+assets = AssetManager(ATLAS_FILE, DERIVED_CACHE_DIR)
@@ -5,9 +5,19 @@ import pygame
 import math
 import random
 from config import GRAVITY, GROUND_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT
+import telemetry
 
 class Ball:
-    def __init__(self, x, y):
+    # Fixed attribute layout: no per-instance dict, faster attribute access
+    __slots__ = ("x", "y", "radius", "color", "vel_x", "vel_y", "bounce_factor", "air_resistance",
+                 "ground_friction", "collision_cooldown", "last_collision_entity", "rng",
+                 "prev_x", "prev_y")
+    
+    # The fields snapshot() captures, in order
+    STATE = ("x", "y", "vel_x", "vel_y", "collision_cooldown", "last_collision_entity",
+             "prev_x", "prev_y")
+    
+    def __init__(self, x, y, rng=None):
         self.x = x
         self.y = y
         self.radius = 20
@@ -20,14 +30,17 @@ class Ball:
         self.air_resistance = 0.98  # Increased air resistance to slow down the ball
         self.ground_friction = 0.94  # Increased ground friction to slow down rolling
         
-        # Create a simple circle for now (will be replaced with sprites later)
-        self.rect = pygame.Rect(x - self.radius, y - self.radius, 
-                               self.radius * 2, self.radius * 2)
-        
         # Collision cooldown to prevent multiple collisions in a single frame
         self.collision_cooldown = 0
         self.last_collision_entity = None
         
+        # Random stream for collision jitter (shared with the rest of the match)
+        self.rng = rng if rng is not None else random.Random()
+        
+        # Position before the latest physics step, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
+        
     def apply_force(self, force_x, force_y):
         """Apply a force to the ball"""
         self.vel_x += force_x
@@ -42,9 +55,44 @@ class Ball:
         self.collision_cooldown = 0
         self.last_collision_entity = None
         
-        # Update rectangle position
-        self.rect.x = self.x - self.radius
-        self.rect.y = self.y - self.radius
+        # Don't interpolate across the jump back to the kickoff spot
+        self.prev_x = x
+        self.prev_y = y
+        
+    @property
+    def rect(self):
+        """Bounding rectangle of the ball (built on demand)"""
+        return pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius * 2, self.radius * 2)
+        
+    def clone(self, rng=None):
+        """Copy of the ball for lookahead, drawing its jitter from rng"""
+        ball = Ball.__new__(Ball)
+        ball.radius, ball.color = self.radius, self.color
+        ball.bounce_factor, ball.air_resistance, ball.ground_friction = (
+            self.bounce_factor, self.air_resistance, self.ground_friction)
+        ball.rng = rng if rng is not None else self.rng
+        ball.restore(self.snapshot())
+        return ball
+        
+    def snapshot(self):
+        """Return the physics state (the STATE fields) as a tuple (see restore)"""
+        return (self.x, self.y, self.vel_x, self.vel_y, self.collision_cooldown,
+                self.last_collision_entity, self.prev_x, self.prev_y)
+        
+    def restore(self, state):
+        """Restore physics state captured by snapshot"""
+        (self.x, self.y, self.vel_x, self.vel_y, self.collision_cooldown,
+         self.last_collision_entity, self.prev_x, self.prev_y) = state
+        
+    def save_previous(self):
+        """Remember the current position before the next physics step"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
+    def interpolated_position(self, alpha):
+        """Blend the previous and current position (alpha 0 = previous, 1 = current)"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
         
     def update(self):
         # Apply gravity
@@ -91,10 +139,6 @@ class Ball:
         if self.y - self.radius < 0:
             self.y = self.radius
             self.vel_y = -self.vel_y * self.bounce_factor
-            
-        # Update rectangle position
-        self.rect.x = self.x - self.radius
-        self.rect.y = self.y - self.radius
         
     def check_player_collision(self, player):
         """Check if the ball collides with a player's head or body"""
@@ -134,7 +178,7 @@ class Ball:
             
             # Add slight randomness to make it feel more natural
             angle_randomness = 0.05
-            angle += random.uniform(-angle_randomness, angle_randomness)
+            angle += self.rng.uniform(-angle_randomness, angle_randomness)
             
             # Calculate new velocities
             self.vel_x = math.cos(angle) * force
@@ -148,8 +192,10 @@ class Ball:
             self.collision_cooldown = 10
             self.last_collision_entity = player
             
-            # Print collision info for debugging
-            print(f"{'HUMAN' if is_human else 'AI'} Ball head collision! Force: {force}, New velocity: ({self.vel_x}, {self.vel_y})")
+            # Record collision info for debugging
+            if telemetry.level >= telemetry.DEBUG:
+                telemetry.record(telemetry.COLLISION, "human" if is_human else "ai", "head",
+                                 self.vel_x, self.vel_y, force)
             
             return True
             
@@ -210,11 +256,19 @@ class Ball:
             self.collision_cooldown = 5
             self.last_collision_entity = player
                 
-            print(f"{'HUMAN' if is_human else 'AI'} Ball body collision! New velocity: ({self.vel_x}, {self.vel_y})")
+            if telemetry.level >= telemetry.DEBUG:
+                telemetry.record(telemetry.COLLISION, "human" if is_human else "ai", "body",
+                                 self.vel_x, self.vel_y, None)
             return True
                 
         return False
         
+    def bounding_rect(self, alpha=1.0):
+        """Screen area touched by draw()"""
+        x, y = self.interpolated_position(alpha)
+        return pygame.Rect(int(x) - self.radius - 2, int(y) - self.radius - 2,
+                           self.radius * 2 + 5, self.radius * 2 + 5)
+        
     def check_goal_collision(self, left_goal, right_goal):
         """Check if the ball enters either goal"""
         # Check left goal
@@ -222,7 +276,6 @@ class Ball:
             self.x + self.radius > left_goal.x and
             self.y - self.radius < left_goal.y + left_goal.height and
             self.y + self.radius > left_goal.y):
-            print("Ball entered left goal!")
             return "right"  # Right player scores
             
         # Check right goal
@@ -230,19 +283,21 @@ class Ball:
             self.x + self.radius > right_goal.x and
             self.y - self.radius < right_goal.y + right_goal.height and
             self.y + self.radius > right_goal.y):
-            print("Ball entered right goal!")
             return "left"  # Left player scores
             
         return None  # No goal
         
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        # Draw at the position interpolated between the last two physics steps
+        x, y = self.interpolated_position(alpha)
+        
         # Draw ball
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+        pygame.draw.circle(screen, self.color, (int(x), int(y)), self.radius)
         
         # Draw pattern on ball (simple lines for now)
         pygame.draw.line(screen, (0, 0, 0), 
-                        (self.x - self.radius, self.y), 
-                        (self.x + self.radius, self.y), 2)
+                        (x - self.radius, y), 
+                        (x + self.radius, y), 2)
         pygame.draw.line(screen, (0, 0, 0), 
-                        (self.x, self.y - self.radius), 
-                        (self.x, self.y + self.radius), 2)
+                        (x, y - self.radius), 
+                        (x, y + self.radius), 2)
@@ -0,0 +1,507 @@
+"""
+Vectorized batch physics for Head Football.
+
+BallBatch and PlayerBatch hold the state of N independent matches in NumPy
+arrays (one lane per match) and advance all of them at once with the same
+rules as Ball.update, Ball.check_player_collision and Player.update. This is
+meant for parameter sweeps and training, where stepping one Ball at a time
+is far too slow. Requires NumPy (pip install numpy).
+
+Check the batch engine against the scalar classes with:
+    python batch_physics.py [--lanes 32] [--ticks 600]
+"""
+import argparse
+import os
+import random
+import numpy as np
+from config import GRAVITY, GROUND_HEIGHT, SCREEN_WIDTH
+
+# Same physics constants as Ball
+BALL_RADIUS = 20
+BOUNCE_FACTOR = 0.6
+AIR_RESISTANCE = 0.98
+GROUND_FRICTION = 0.94
+
+# Value of BallBatch.last_entity when no player touched the ball
+NO_ENTITY = -1
+
+
+class BatchDivergence(AssertionError):
+    """Raised when a batch lane leaves its scalar twin"""
+    def __init__(self, field, tick, lane, scalar, batch):
+        self.field = field
+        self.tick = tick
+        self.lane = lane
+        if isinstance(batch, np.generic):
+            batch = batch.item()
+        self.scalar = scalar
+        self.batch = batch
+        super().__init__(f"{field} diverged at tick {tick}, lane {lane} "
+                         f"(scalar {scalar!r}, batch {batch!r})")
+
+
+class PlayerBatch:
+    """One player per lane, mirroring Player's physics state"""
+    def __init__(self, n, x, y, profile, is_human, has_sprite=True, speed_factor=1.0, entity_id=0):
+        self.n = n
+        self.entity_id = entity_id
+        self.width = 50
+        self.height = 100
+
+        self.x = np.full(n, x, dtype=np.float64)
+        self.y = np.full(n, y, dtype=np.float64)
+        self.vel_x = np.zeros(n)
+        self.vel_y = np.zeros(n)
+        self.speed = np.full(n, profile["speed"] * speed_factor, dtype=np.float64)
+        self.jump_power = np.full(n, profile["jump"], dtype=np.float64)
+        self.heading_power = np.full(n, profile["power"], dtype=np.float64)
+
+        self.is_human = np.full(n, is_human, dtype=bool)
+        self.has_sprite = np.full(n, has_sprite, dtype=bool)
+        self.is_jumping = np.zeros(n, dtype=bool)
+        self.is_heading = np.zeros(n, dtype=bool)
+        # Small counters, kept in int8 so passes over them are cheap
+        self.heading_cooldown = np.zeros(n, dtype=np.int8)
+        self.heading_frames = np.zeros(n, dtype=np.int8)
+
+        # Scratch arrays reused every tick instead of allocating temporaries
+        self.mask = np.empty(n, dtype=bool)
+        self.scratch = np.empty(n)
+
+    @classmethod
+    def from_players(cls, players, entity_id=0):
+        """Build a batch from a list of Player objects, one per lane"""
+        batch = cls(len(players), 0, 0, players[0].profile, True, entity_id=entity_id)
+        for i, player in enumerate(players):
+            batch.x[i] = player.x
+            batch.y[i] = player.y
+            batch.vel_x[i] = player.vel_x
+            batch.vel_y[i] = player.vel_y
+            batch.speed[i] = player.speed
+            batch.jump_power[i] = player.jump_power
+            batch.heading_power[i] = player.heading_power
+            batch.is_human[i] = player.is_player
+            batch.has_sprite[i] = player.sprite is not None
+            batch.is_jumping[i] = player.is_jumping
+            batch.is_heading[i] = player.is_heading
+            batch.heading_cooldown[i] = player.heading_cooldown
+            batch.heading_frames[i] = getattr(player, 'heading_frames', 0)
+        return batch
+
+    def move(self, direction):
+        """Set horizontal velocity from a per-lane direction of -1, 0 or 1"""
+        np.copyto(self.vel_x, direction)  # converting first is faster than a mixed multiply
+        self.vel_x *= self.speed
+
+    def jump(self, mask):
+        """Jump in the lanes selected by mask (same as Player.jump)"""
+        start = np.logical_not(self.is_jumping, out=self.mask)
+        start &= mask
+        idx = np.flatnonzero(start)
+        self.vel_y[idx] = -self.jump_power[idx]
+        self.is_jumping[idx] = True
+
+    def head(self, mask):
+        """Start a header in the lanes selected by mask, returning where it started"""
+        start = mask & (self.heading_cooldown <= 0)
+        idx = np.flatnonzero(start)
+        if idx.size:
+            human = self.is_human[idx]
+            jumping = self.is_jumping[idx]
+            self.is_heading[idx] = True
+            self.heading_cooldown[idx] = 15
+            self.heading_frames[idx] = np.where(human, 8, 5)
+
+            # Small upward boost, larger on the ground and for the human player:
+            # 4 or 3 on the ground, halved (2 or 1.5, exactly) when jumping
+            boost = human + 3.0
+            boost /= jumping + 1
+            self.vel_y[idx] -= boost
+            self.is_jumping[idx] = True
+        return start
+
+    def head_position(self, idx):
+        """Head position of the given lanes used for collisions (Player.get_head_position)"""
+        y = self.y[idx]
+        head_x = self.x[idx] + self.width // 2
+        head_y = np.where(self.has_sprite[idx], y,
+                          np.where(self.is_heading[idx], y - 5, y + 15))
+        return head_x, head_y
+
+    def update(self):
+        """Advance every lane by one tick (Player.update without celebrations)"""
+        x, y, vel_y = self.x, self.y, self.vel_y
+        mask = self.mask
+        vel_y += GRAVITY
+        x += self.vel_x
+        y += vel_y
+
+        # Boundary checks
+        np.clip(x, 0, SCREEN_WIDTH - self.width, out=x)
+
+        # Ground collision: mask holds the lanes still in the air (converted
+        # to float before multiplying, which beats a mixed bool multiply)
+        np.less_equal(y, GROUND_HEIGHT - self.height, out=mask)
+        np.minimum(y, GROUND_HEIGHT - self.height, out=y)
+        np.copyto(self.scratch, mask)
+        vel_y *= self.scratch
+        self.is_jumping &= mask
+
+        # Update heading state (a lane that isn't heading never has frames
+        # left, so zeroing the lanes without frames left only resets the
+        # headers that just ended)
+        heading_frames = self.heading_frames
+        heading_frames -= self.is_heading
+        np.greater(heading_frames, 0, out=mask)
+        self.is_heading &= mask
+        heading_frames *= mask
+
+        # Update cooldown (never negative, so this only counts down positive values)
+        cooldown = self.heading_cooldown
+        np.greater(cooldown, 0, out=mask)
+        cooldown -= mask
+
+
+class BallBatch:
+    """One ball per lane, mirroring Ball's physics state"""
+    def __init__(self, n, x, y, jitter=None, seed=None):
+        self.n = n
+        self.radius = BALL_RADIUS
+        self.x = np.full(n, x, dtype=np.float64)
+        self.y = np.full(n, y, dtype=np.float64)
+        self.vel_x = np.zeros(n)
+        self.vel_y = np.zeros(n)
+        self.collision_cooldown = np.zeros(n, dtype=np.int8)
+        self.last_entity = np.full(n, NO_ENTITY, dtype=np.int8)
+
+        # Scratch arrays reused every tick instead of allocating temporaries
+        self.mask = np.empty(n, dtype=bool)
+        self.other_mask = np.empty(n, dtype=bool)
+        self.scratch = np.empty(n)
+
+        # Header angle jitter: a callable returning k draws in [-0.05, 0.05]
+        if jitter is None:
+            rng = np.random.default_rng(seed)
+            jitter = lambda k: rng.uniform(-0.05, 0.05, k)
+        self.jitter = jitter
+
+    def reset(self, mask, x, y):
+        """Reset the balls in the selected lanes (Ball.reset)"""
+        self.x[mask] = x
+        self.y[mask] = y
+        self.vel_x[mask] = 0
+        self.vel_y[mask] = 0
+        self.collision_cooldown[mask] = 0
+        self.last_entity[mask] = NO_ENTITY
+
+    def scale(self, values, mask, factor):
+        """Multiply values by factor (between 0.5 and 2) in the lanes selected by mask.
+
+        Every lane is multiplied by 1 + mask * (factor - 1), which for such a
+        factor is exactly factor or 1; writing through a mask that picks
+        lanes at random is several times slower.
+        """
+        scaled = self.scratch
+        np.copyto(scaled, mask)
+        scaled *= factor - 1
+        scaled += 1
+        values *= scaled
+
+    def update(self):
+        """Advance every ball by one tick (Ball.update)"""
+        r = self.radius
+        x, y, vel_x, vel_y = self.x, self.y, self.vel_x, self.vel_y
+        mask, ground, scratch = self.mask, self.other_mask, self.scratch
+
+        # Gravity, air resistance and movement, one axis at a time so each
+        # pass finds its arrays still in cache
+        vel_y += GRAVITY
+        vel_y *= AIR_RESISTANCE
+        y += vel_y
+        vel_x *= AIR_RESISTANCE
+        x += vel_x
+
+        # Boundary checks - X axis, gathering the few lanes at a wall. Adding
+        # the radius to a coordinate near the screen edges is exact, so
+        # x + r > SCREEN_WIDTH is the same test as x > SCREEN_WIDTH - r (and
+        # likewise for the ground).
+        np.less(x, r, out=mask)  # same test as x - r < 0
+        if mask.any():
+            idx = np.flatnonzero(mask)
+            x[idx] = r
+            vel_x[idx] = -vel_x[idx] * BOUNCE_FACTOR
+        np.greater(x, SCREEN_WIDTH - r, out=mask)
+        if mask.any():
+            idx = np.flatnonzero(mask)
+            x[idx] = SCREEN_WIDTH - r
+            vel_x[idx] = -vel_x[idx] * BOUNCE_FACTOR
+
+        # Boundary check - Ground, with bounce and friction. Resting balls
+        # land every tick, so this works on all lanes instead of gathering.
+        np.greater(y, GROUND_HEIGHT - r, out=ground)
+        if ground.any():
+            np.minimum(y, GROUND_HEIGHT - r, out=y)
+            # Landing lanes bounce (-BOUNCE_FACTOR) or stop (0), the rest keep vel_y (1)
+            np.abs(vel_y, out=scratch)
+            np.greater(scratch, 2.0, out=mask)
+            mask &= ground
+            np.copyto(scratch, mask)
+            scratch *= -BOUNCE_FACTOR
+            np.logical_not(ground, out=mask)
+            scratch += mask
+            vel_y *= scratch
+            self.scale(vel_x, ground, GROUND_FRICTION)
+            np.abs(vel_x, out=scratch)
+            np.less(scratch, 0.5, out=mask)
+            mask &= ground
+            self.scale(vel_x, mask, 0.8)
+
+        # Update collision cooldown
+        cooldown = self.collision_cooldown
+        np.greater(cooldown, 0, out=mask)
+        cooldown -= mask
+
+        # Boundary check - Ceiling
+        np.less(y, r, out=mask)  # same test as y - r < 0
+        if mask.any():
+            idx = np.flatnonzero(mask)
+            y[idx] = r
+            vel_y[idx] = -vel_y[idx] * BOUNCE_FACTOR
+
+    def check_player_collision(self, players):
+        """Head and body collisions against one player per lane.
+
+        Returns a boolean mask of the lanes where the ball was hit.
+        """
+        r = self.radius
+        hit = np.zeros(self.n, dtype=bool)
+
+        # Cheap broad phase: only lanes where the ball is within reach of the
+        # player's head or padded body box (51 px across and 101 px up or
+        # down from its centre) get the exact tests below. Across is tested
+        # on every lane, up and down only on the lanes that passed.
+        px, py = players.x, players.y
+        offset, near, mask = self.scratch, self.other_mask, self.mask
+        np.subtract(self.x, px, out=offset)
+        np.greater(offset, players.width // 2 - 51, out=near)
+        np.less(offset, players.width // 2 + 51, out=mask)
+        near &= mask
+        idx = np.flatnonzero(near)
+        if not idx.size:
+            return hit
+        offset = self.y[idx] - py[idx]
+        near = (offset > players.height // 2 - 101) & (offset < players.height // 2 + 101)
+
+        # Skip lanes on cooldown with this player
+        near &= ~((self.collision_cooldown[idx] > 0) & (self.last_entity[idx] == players.entity_id))
+        idx = idx[near]
+        if not idx.size:
+            return hit
+
+        x, y = self.x[idx], self.y[idx]
+        px, py = px[idx], py[idx]
+        pw, ph = players.width, players.height
+        human = players.is_human[idx]
+        cooldown = self.collision_cooldown[idx]
+
+        # Head collision, only while the player is heading
+        head_x, head_y = players.head_position(idx)
+        head_radius = np.where(human, 25, 20)
+        head_distance = np.sqrt((x - head_x) ** 2 + (y - head_y) ** 2)
+        head_hit = players.is_heading[idx] & (head_distance < (r + head_radius))
+
+        # Body collision box, padded for the human player
+        pad = np.where(human, 5, 0)
+        body_hit = (~head_hit & (cooldown <= 0) &
+                    (x + r > px - pad) & (x - r < px + pw + pad) &
+                    (y + r > py - pad) & (y - r < py + ph + pad))
+
+        # Only the lanes that were hit change from here on
+        lane_hit = head_hit | body_hit
+        if not lane_hit.any():
+            return hit
+        idx, head_hit, body_hit = idx[lane_hit], head_hit[lane_hit], body_hit[lane_hit]
+        x, y, px, py, human = x[lane_hit], y[lane_hit], px[lane_hit], py[lane_hit], human[lane_hit]
+        head_x, head_y, head_radius = head_x[lane_hit], head_y[lane_hit], head_radius[lane_hit]
+        vel_x, vel_y = self.vel_x[idx], self.vel_y[idx]
+
+        new_x, new_y = x.copy(), y.copy()
+        new_vel_x, new_vel_y = vel_x.copy(), vel_y.copy()
+
+        if head_hit.any():
+            h = head_hit
+            hx, hy, hr = head_x[h], head_y[h], head_radius[h]
+            angle = np.arctan2(y[h] - hy, x[h] - hx)
+            force = players.heading_power[idx[h]] * np.where(human[h], 0.8, 0.7)
+            angle = angle + self.jitter(int(h.sum()))
+            cos, sin = np.cos(angle), np.sin(angle)
+            new_vel_x[h] = cos * force
+            new_vel_y[h] = sin * force - 1.5
+            # Move ball outside of collision to prevent sticking
+            new_x[h] = hx + cos * (r + hr + 2)
+            new_y[h] = hy + sin * (r + hr + 2)
+
+        if body_hit.any():
+            b = body_hit
+            bx, by = x[b], y[b]
+            bvx, bvy = vel_x[b], vel_y[b]
+            pvx, pvy = players.vel_x[idx[b]], players.vel_y[idx[b]]
+
+            # Collision normal from the closest point on the body box
+            normal_x = bx - np.maximum(np.minimum(bx, px[b] + pw), px[b])
+            normal_y = by - np.maximum(np.minimum(by, py[b] + ph), py[b])
+            length = np.sqrt(normal_x ** 2 + normal_y ** 2)
+            outside = length > 0
+            safe_length = np.where(outside, length, 1.0)
+            normal_x = np.where(outside, normal_x / safe_length, 0.0)
+            normal_y = np.where(outside, normal_y / safe_length, -1.0)
+
+            # Impulse from relative velocity
+            rel_vel_x = bvx - pvx * 0.7
+            rel_vel_y = bvy - pvy * 0.7
+            impulse = 1.5 * (rel_vel_x * normal_x + rel_vel_y * normal_y)
+            bvx = bvx - impulse * normal_x * 0.6
+            bvy = bvy - impulse * normal_y * 0.6
+            bvx = bvx + pvx * 0.2
+
+            # Ensure the ball doesn't get stuck
+            direction = np.where(pvx >= 0, 1, -1)
+            bvx = np.where(np.abs(bvx) < 0.8, bvx + direction * 0.8, bvx)
+            bvy = np.where(bvy > 0, -bvy * 0.4 - 0.8, bvy)
+
+            # Move ball outside of collision to prevent sticking
+            overlap = r + 2 - length
+            push = overlap > 0
+            new_x[b] = np.where(push, bx + normal_x * overlap, bx)
+            new_y[b] = np.where(push, by + normal_y * overlap, by)
+            new_vel_x[b] = bvx
+            new_vel_y[b] = bvy
+
+        self.x[idx], self.y[idx] = new_x, new_y
+        self.vel_x[idx], self.vel_y[idx] = new_vel_x, new_vel_y
+        self.collision_cooldown[idx] = np.where(head_hit, 10, 5)
+        self.last_entity[idx] = players.entity_id
+        hit[idx] = True
+        return hit
+
+
+def random_controls(rng, n):
+    """Random per-lane controls: (direction, jump mask, head mask)"""
+    direction = rng.integers(-1, 2, n, dtype=np.int8)
+    return direction, rng.random(n) < 0.05, rng.random(n) < 0.1
+
+
+def verify_against_scalar(lanes=32, ticks=600, seed=1234, tolerance=1e-9):
+    """Step scalar Ball/Player objects and the batch engine side by side.
+
+    Both paths get the same random controls and the same header jitter draws,
+    so every lane must stay within tolerance of its scalar twin. Returns the
+    largest difference seen; raises BatchDivergence on divergence.
+    """
+    from ball import Ball
+    from player import Player
+    from config import PLAYER_PROFILES
+
+    rng = np.random.default_rng(seed)
+    profile_names = list(PLAYER_PROFILES)
+
+    # The scalar balls share one header jitter stream; the batch gets an
+    # identically seeded stream, consumed in the same order.
+    scalar_random = random.Random(seed)
+    batch_random = random.Random(seed)
+
+    balls, lefts, rights = [], [], []
+    for lane in range(lanes):
+        balls.append(Ball(rng.uniform(100, 700), rng.uniform(100, 400), rng=scalar_random))
+        balls[-1].vel_x, balls[-1].vel_y = rng.uniform(-10, 10), rng.uniform(-10, 5)
+        lefts.append(Player(rng.uniform(50, 350), GROUND_HEIGHT - 100,
+                            PLAYER_PROFILES[profile_names[lane % 5]], is_player=True))
+        rights.append(Player(rng.uniform(400, 700), GROUND_HEIGHT - 100,
+                             PLAYER_PROFILES[profile_names[(lane + 2) % 5]], is_player=False))
+
+    ball_batch = BallBatch(lanes, 0, 0,
+                           jitter=lambda k: np.array([batch_random.uniform(-0.05, 0.05) for _ in range(k)]))
+    for i, ball in enumerate(balls):
+        ball_batch.x[i], ball_batch.y[i] = ball.x, ball.y
+        ball_batch.vel_x[i], ball_batch.vel_y[i] = ball.vel_x, ball.vel_y
+    left_batch = PlayerBatch.from_players(lefts, entity_id=0)
+    right_batch = PlayerBatch.from_players(rights, entity_id=1)
+    ids = {}
+    for lane in range(lanes):
+        ids[id(lefts[lane])], ids[id(rights[lane])] = 0, 1
+
+    worst = 0.0
+    for tick in range(ticks):
+        controls = [random_controls(rng, lanes), random_controls(rng, lanes)]
+
+        # Scalar path, phase by phase so header jitter draws line up with the batch
+        for side, (direction, jump, head) in zip((lefts, rights), controls):
+            for lane, player in enumerate(side):
+                player.vel_x = int(direction[lane]) * player.speed
+                if jump[lane]:
+                    player.jump()
+                if head[lane]:
+                    player.head()
+        for side in (lefts, rights):
+            for lane, player in enumerate(side):
+                balls[lane].check_player_collision(player)
+        for lane in range(lanes):
+            balls[lane].update()
+            lefts[lane].update()
+            rights[lane].update()
+
+        # Batch path
+        for batch, (direction, jump, head) in zip((left_batch, right_batch), controls):
+            batch.move(direction)
+            batch.jump(jump)
+            batch.head(head)
+        ball_batch.check_player_collision(left_batch)
+        ball_batch.check_player_collision(right_batch)
+        ball_batch.update()
+        left_batch.update()
+        right_batch.update()
+
+        for lane, ball in enumerate(balls):
+            last = ids.get(id(ball.last_collision_entity), NO_ENTITY)
+            if ball.collision_cooldown != ball_batch.collision_cooldown[lane]:
+                raise BatchDivergence("ball.collision_cooldown", tick, lane, ball.collision_cooldown,
+                                      ball_batch.collision_cooldown[lane])
+            if last != ball_batch.last_entity[lane]:
+                raise BatchDivergence("ball.last_entity", tick, lane, last, ball_batch.last_entity[lane])
+            for name in ("x", "y", "vel_x", "vel_y"):
+                value, batch_value = getattr(ball, name), getattr(ball_batch, name)[lane]
+                diff = abs(value - batch_value)
+                worst = max(worst, diff)
+                if not diff <= tolerance:
+                    raise BatchDivergence(f"ball.{name}", tick, lane, value, batch_value)
+            for side, player, batch in (("left", lefts[lane], left_batch), ("right", rights[lane], right_batch)):
+                if player.is_heading != batch.is_heading[lane]:
+                    raise BatchDivergence(f"{side}.is_heading", tick, lane, player.is_heading,
+                                          batch.is_heading[lane])
+                for name in ("x", "y", "vel_x", "vel_y"):
+                    value, batch_value = getattr(player, name), getattr(batch, name)[lane]
+                    diff = abs(value - batch_value)
+                    worst = max(worst, diff)
+                    if not diff <= tolerance:
+                        raise BatchDivergence(f"{side}.{name}", tick, lane, value, batch_value)
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the batch engine against Ball and Player")
+    parser.add_argument("--lanes", type=int, default=32, help="matches stepped side by side")
+    parser.add_argument("--ticks", type=int, default=600, help="ticks to step")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for the controls and jitter")
+    args = parser.parse_args()
+    try:
+        worst = verify_against_scalar(args.lanes, args.ticks, args.seed)
+    except BatchDivergence as e:
+        print(e)
+        raise SystemExit(1)
+    print(f"Batch engine matches the scalar classes over {args.lanes} lanes x {args.ticks} ticks "
+          f"(largest difference {worst:.1e})")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    main()
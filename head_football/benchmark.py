@@ -0,0 +1,572 @@
+"""
+Performance benchmarks for Head Football.
+
+Run from the head_football directory:
+    python benchmark.py              # every benchmark
+    python benchmark.py simulation   # just one of them
+
+The "micro" benchmark times the physics, AI and rendering hot paths one call
+at a time. Its results can be saved as a JSON baseline and later compared,
+failing (exit status 1) when any case got slower than the threshold:
+    python benchmark.py micro --save-baseline baseline.json
+    python benchmark.py micro --compare baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+
+# Benchmarks never need a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from config import PLAYER_PROFILES, DIFFICULTY_SETTINGS, GROUND_HEIGHT, SCREEN_WIDTH
+from simulation import Match, MatchRandom, ChaseInput, run_match
+
+
+def bench_simulation(matches=5, difficulty="Medium"):
+    """Measure headless simulation throughput in ticks per second"""
+    games = [Match(PLAYER_PROFILES["Balanced"], PLAYER_PROFILES["Speedy"],
+                   DIFFICULTY_SETTINGS[difficulty], seed=i) for i in range(matches)]
+
+    ticks = 0
+    start = time.perf_counter()
+    for match in games:
+        ticks += run_match(match, ChaseInput())["ticks"]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "matches": matches,
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed,
+        "summary": f"{matches} matches ({ticks} ticks) in {elapsed:.2f}s: "
+                   f"{ticks / elapsed:,.0f} ticks/s ({ticks / elapsed / 60:,.0f}x real time)",
+    }
+
+
+def bench_batch_physics(lanes=50000, ticks=100, scalar_balls=200, repeats=3):
+    """Compare ball-ticks per second of BallBatch against looping over Ball objects"""
+    import numpy as np
+    from ball import Ball
+    from player import Player
+    from batch_physics import BallBatch, PlayerBatch, random_controls, verify_against_scalar
+
+    # Refuse to report numbers for an engine that disagrees with the scalar path
+    verify_against_scalar(lanes=16, ticks=300)
+
+    profile = PLAYER_PROFILES["Balanced"]
+    rng = np.random.default_rng(0)
+
+    controls = [random_controls(rng, lanes) for _ in range(ticks)]
+    scalar_controls = [(d.tolist(), j.tolist(), h.tolist()) for d, j, h in controls]
+
+    # Scalar path: Ball objects against one player each, with the same controls
+    def time_scalar():
+        balls = [Ball(SCREEN_WIDTH // 2, GROUND_HEIGHT - 200) for _ in range(scalar_balls)]
+        players = [Player(SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, profile) for _ in range(scalar_balls)]
+        start = time.perf_counter()
+        for direction, jump, head in scalar_controls:
+            for lane, (ball, player) in enumerate(zip(balls, players)):
+                player.vel_x = direction[lane] * player.speed
+                if jump[lane]:
+                    player.jump()
+                if head[lane]:
+                    player.head()
+                ball.check_player_collision(player)
+                ball.update()
+                player.update()
+        return time.perf_counter() - start
+
+    # Batch path: the same work for every lane in one vectorized step
+    def time_batch():
+        ball_batch = BallBatch(lanes, SCREEN_WIDTH // 2, GROUND_HEIGHT - 200, seed=0)
+        player_batch = PlayerBatch(lanes, SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, profile, is_human=True)
+        start = time.perf_counter()
+        for direction, jump, head in controls:
+            player_batch.move(direction)
+            player_batch.jump(jump)
+            player_batch.head(head)
+            ball_batch.check_player_collision(player_batch)
+            ball_batch.update()
+            player_batch.update()
+        return time.perf_counter() - start
+
+    # Best of a few runs, so a busy machine doesn't skew the ratio either way
+    scalar_rate = scalar_balls * ticks / min(time_scalar() for _ in range(repeats))
+    batch_rate = lanes * ticks / min(time_batch() for _ in range(repeats))
+
+    return {
+        "scalar_ball_ticks_per_second": scalar_rate,
+        "batch_ball_ticks_per_second": batch_rate,
+        "speedup": batch_rate / scalar_rate,
+        "summary": f"scalar {scalar_rate:,.0f} ball-ticks/s, batch ({lanes} lanes) "
+                   f"{batch_rate:,.0f} ball-ticks/s: {batch_rate / scalar_rate:,.0f}x",
+    }
+
+
+def bench_particles(particles=5000, ticks=60):
+    """Time one update and draw of a large confetti burst"""
+    import pygame
+    from particles import ParticleSystem
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, 600))
+    system = ParticleSystem(capacity=particles, seed=0)
+    system.convert()
+    system.emit(particles, SCREEN_WIDTH // 2, 300, spread_x=100, spread_y=75,
+                vel_x=(-5, 5), vel_y=(-8, -2), lifetime=(ticks, ticks * 2))
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        system.update()
+        system.draw(screen, 0.5)
+    per_frame = (time.perf_counter() - start) / ticks
+
+    return {
+        "particles": particles,
+        "ms_per_frame": per_frame * 1000,
+        "summary": f"{particles} particles: {per_frame * 1000:.2f} ms per update+draw",
+    }
+
+
+def bench_hud(frames=600):
+    """Time the in-match HUD over ten seconds of match clock"""
+    import pygame
+    from ui import UI
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, 600))
+    ui = UI()
+    ui.selected_player, ui.selected_difficulty = "Balanced", "Medium"
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        ui.draw_game_hud(screen, 1, 0, 120 - frame // 60)
+    per_frame = (time.perf_counter() - start) / frames
+    stats = ui.hud.stats()
+
+    return {
+        "ms_per_frame": per_frame * 1000,
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "summary": f"{per_frame * 1000:.3f} ms per HUD draw, "
+                   f"{stats['hits']} cache hits / {stats['misses']} misses",
+    }
+
+
+def draw_background_per_line(screen):
+    """The menu background as it used to be drawn every frame, for comparison"""
+    import pygame
+    width, height = screen.get_size()
+    for y in range(0, height, 2):
+        color_value = int(200 - y / height * 100)
+        pygame.draw.line(screen, (color_value, color_value + 30, 255), (0, y), (width, y))
+    pygame.draw.rect(screen, (34, 139, 34), (0, height - 100, width, 100))
+    pygame.draw.circle(screen, (255, 255, 255), (100, 100), 40, 2)
+    pygame.draw.circle(screen, (255, 255, 255), (width - 100, 100), 40, 2)
+
+
+def bench_menu(frames=300):
+    """Compare a main menu frame drawing the background per line vs prerendered"""
+    import pygame
+    from ui import UI
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, 600))
+    ui = UI()
+
+    # Both variants must produce the same picture
+    reference = screen.copy()
+    draw_background_per_line(reference)
+    ui.draw_background(screen)
+    if pygame.image.tobytes(reference, "RGB") != pygame.image.tobytes(screen, "RGB"):
+        raise AssertionError("prerendered menu background differs from the per-line drawing")
+
+    def time_frames(draw_background):
+        ui.draw_background = draw_background
+        start = time.perf_counter()
+        for _ in range(frames):
+            ui.draw_menu(screen)
+        return (time.perf_counter() - start) / frames
+
+    cached = time_frames(ui.draw_background)
+    per_line = time_frames(draw_background_per_line)
+    del ui.draw_background
+
+    return {
+        "per_line_ms": per_line * 1000,
+        "prerendered_ms": cached * 1000,
+        "speedup": per_line / cached,
+        "summary": f"menu frame {per_line * 1000:.3f} ms per-line -> "
+                   f"{cached * 1000:.3f} ms prerendered ({per_line / cached:.1f}x)",
+    }
+
+
+def bench_assets(repeats=20):
+    """Time loading every game image from the PNGs vs the texture atlas"""
+    import pygame
+    from assets import AssetManager, game_images
+    from build_atlas import build_atlas
+    from config import ATLAS_FILE
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, 600))
+    if not os.path.exists(ATLAS_FILE):
+        build_atlas(ATLAS_FILE)
+    entries = game_images()
+
+    def time_loads(atlas_path):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            manager = AssetManager(atlas_path)
+            for path, size in entries:
+                manager.get(path, size)
+        return (time.perf_counter() - start) / repeats
+
+    png = time_loads(None)
+    atlas = time_loads(ATLAS_FILE)
+
+    return {
+        "images": len(entries),
+        "png_ms": png * 1000,
+        "atlas_ms": atlas * 1000,
+        "summary": f"{len(entries)} images: {png * 1000:.2f} ms from PNGs, "
+                   f"{atlas * 1000:.2f} ms from the atlas ({png / atlas:.1f}x)",
+    }
+
+
+def bench_entities(ticks=20000):
+    """Per-tick cost of a match and the cost of snapshotting its entities"""
+    match = Match(PLAYER_PROFILES["Balanced"], PLAYER_PROFILES["Speedy"],
+                  DIFFICULTY_SETTINGS["Medium"], seed=0)
+    kickoff = match.snapshot()
+    chase = ChaseInput()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        match.step(chase.read(match))
+        if match.finished:
+            match.restore(kickoff)
+    tick_ns = (time.perf_counter() - start) / ticks * 1e9
+
+    def ns(op, number=100000):
+        return min(timeit.repeat(op, number=number, repeat=5)) / number * 1e9
+
+    lines = [f"match.step {tick_ns:,.0f} ns/tick",
+             f"{'':<12} {'snapshot ns':>12} {'restore ns':>11} {'bytes':>6}"]
+    results = {"tick_ns": tick_ns}
+    for name, entity in (("ball", match.ball), ("player", match.player),
+                         ("ai", match.ai_opponent), ("match", match)):
+        state = entity.snapshot()
+        size = sys.getsizeof(entity) + (sys.getsizeof(vars(entity)) if hasattr(entity, "__dict__") else 0)
+        results[name] = {"snapshot_ns": ns(entity.snapshot), "restore_ns": ns(lambda: entity.restore(state)),
+                         "bytes": size}
+        lines.append(f"{name:<12} {results[name]['snapshot_ns']:>12,.0f} {results[name]['restore_ns']:>11,.0f} "
+                     f"{size:>6}")
+    results["summary"] = "\n" + "\n".join(lines)
+    return results
+
+
+def bench_fork(forks=100000, rollouts=2000, rollout_ticks=60):
+    """Forks per second of a live match, and lookahead rollouts per second"""
+    import golden
+
+    # Refuse to report numbers for forks that don't play on like the original
+    failures = golden.check(fork_every=golden.FORK_EVERY)
+    if failures:
+        raise AssertionError(f"forked matches diverge: {failures[0]}")
+
+    match = Match(PLAYER_PROFILES["Balanced"], PLAYER_PROFILES["Speedy"],
+                  DIFFICULTY_SETTINGS["Hard"], seed=0)
+    chase = ChaseInput()
+    for _ in range(300):
+        match.step(chase.read(match))
+
+    start = time.perf_counter()
+    for _ in range(forks):
+        match.fork()
+    new_rate = forks / (time.perf_counter() - start)
+
+    scratch = match.fork()
+    start = time.perf_counter()
+    for _ in range(forks):
+        match.fork(into=scratch)
+    reuse_rate = forks / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(rollouts):
+        rollout = match.fork(into=scratch)
+        for _ in range(rollout_ticks):
+            rollout.step(chase.read(rollout))
+    rollout_rate = rollouts / (time.perf_counter() - start)
+
+    return {
+        "forks_per_second": new_rate,
+        "reused_forks_per_second": reuse_rate,
+        "rollouts_per_second": rollout_rate,
+        "summary": f"fork() {new_rate:,.0f}/s, fork(into=...) {reuse_rate:,.0f}/s, "
+                   f"{rollout_ticks}-tick rollouts {rollout_rate:,.0f}/s (golden trajectories match)",
+    }
+
+
+def bench_search(ticks=1200):
+    """Search speed of the Expert planner while it plays a chasing player"""
+    match = Match(PLAYER_PROFILES["Balanced"], PLAYER_PROFILES["Speedy"],
+                  DIFFICULTY_SETTINGS["Expert"], seed=0)
+    chase = ChaseInput()
+    start = time.perf_counter()
+    while match.frame < ticks and not match.finished:
+        match.step(chase.read(match))
+    elapsed = time.perf_counter() - start
+
+    results = match.planner.stats()
+    # The search must keep to its budget. Wall-clock time also counts any
+    # pause the OS makes the process take, so the check uses CPU time.
+    budget_ms = DIFFICULTY_SETTINGS["Expert"]["search_budget_ms"]
+    if results["max_think_cpu_ms"] > budget_ms:
+        raise AssertionError(f"the planner took {results['max_think_cpu_ms']:.2f} ms of CPU in one tick, "
+                             f"over its {budget_ms} ms budget")
+    results["ticks_per_second"] = match.frame / elapsed
+    results["score"] = (match.player_score, match.ai_score)
+    results["summary"] = (f"{match.planner.format_stats()}, mean {results['mean_think_ms']:.2f} ms/tick, "
+                          f"score {match.player_score}-{match.ai_score} after {match.frame} ticks")
+    return results
+
+
+def bench_planner_worker(ticks=600):
+    """Game-thread cost and move staleness of the Expert planner in its worker process"""
+    match = Match(PLAYER_PROFILES["Balanced"], PLAYER_PROFILES["Speedy"],
+                  DIFFICULTY_SETTINGS["Expert"], seed=0, background_planner=True)
+    chase = ChaseInput()
+    # Step in real time, as the game does, so the worker gets a tick to answer
+    step_ns = 0
+    start = time.perf_counter()
+    while match.frame < ticks and not match.finished:
+        before = time.perf_counter_ns()
+        match.step(chase.read(match))
+        step_ns += time.perf_counter_ns() - before
+        delay = start + match.frame / match.tick_rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    match.close()
+
+    results = match.planner.stats()
+    results["step_us"] = step_ns / match.frame / 1e3
+    results["summary"] = (f"{results['step_us']:.0f} us/step on the game thread "
+                          f"({results['mean_handoff_us']:.0f} us handing off), "
+                          f"staleness mean {results['mean_staleness']:.2f} max {results['max_staleness']} ticks "
+                          f"(reaction {results['reaction_ticks']}), late {results['late_ticks']}/{results['ticks']}, "
+                          f"{results['fallback_ticks']} ticks before the first move, "
+                          f"{results['nodes_per_second']:,.0f} nodes/s")
+    return results
+
+
+def micro_cases():
+    """Name -> zero-argument callable for each hot path, set up and ready to time"""
+    import main
+    from ball import Ball
+    from player import Player
+    from ai import AIOpponent
+
+    profile = PLAYER_PROFILES["Balanced"]
+    difficulty = DIFFICULTY_SETTINGS["Medium"]
+    cases = {}
+
+    # Ball in flight (it bounces and eventually rolls along the ground)
+    ball = Ball(SCREEN_WIDTH // 2, GROUND_HEIGHT - 200, rng=MatchRandom(0))
+    ball.vel_x, ball.vel_y = 6.0, -8.0
+    cases["ball.update"] = ball.update
+
+    # Collision checks against a standing player: a miss, a header and a body hit
+    player = Player(SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, profile)
+    hit_ball = Ball(0, 0, rng=MatchRandom(0))
+    head_x, head_y = player.get_head_position()
+    positions = {
+        "miss": (SCREEN_WIDTH - 50, 100),
+        "head": (head_x, head_y - 20),
+        "body": (player.x + player.width + 5, player.y + player.height // 2),
+    }
+    for kind, (x, y) in positions.items():
+        def collide(x=x, y=y):
+            hit_ball.x, hit_ball.y = x, y
+            hit_ball.vel_x, hit_ball.vel_y = -2.0, 3.0
+            hit_ball.collision_cooldown = 0
+            player.is_heading = kind == "head"
+            hit_ball.check_player_collision(player)
+        cases[f"ball.check_player_collision[{kind}]"] = collide
+
+    # Player jumping continuously
+    jumper = Player(SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, profile)
+
+    def jump_and_update():
+        if not jumper.is_jumping:
+            jumper.jump()
+        jumper.update()
+    cases["player.update"] = jump_and_update
+
+    # AI deciding with the ball just above it. Between decisions it only
+    # counts down its reaction time, so that path is timed separately
+    ai = AIOpponent(SCREEN_WIDTH * 3 // 4, GROUND_HEIGHT - 100, profile, difficulty, rng=MatchRandom(0))
+    near_ball = Ball(ai.x + 20, ai.y - 30, rng=MatchRandom(0))
+
+    def decide():
+        ai.decision_timer = 0
+        ai.decide_action(near_ball)
+    cases["ai.decide_action"] = decide
+    waiting_ai = AIOpponent(SCREEN_WIDTH * 3 // 4, GROUND_HEIGHT - 100, profile, difficulty, rng=MatchRandom(0))
+    waiting_ai.decision_timer = 1 << 62
+    cases["ai.decide_action[waiting]"] = lambda: waiting_ai.decide_action(near_ball)
+
+    # Whole match ticks, starting over when the match ends
+    match = Match(profile, PLAYER_PROFILES["Speedy"], difficulty, seed=0)
+    kickoff = match.snapshot()
+    chase = ChaseInput()
+
+    def tick():
+        match.step(chase.read(match))
+        if match.finished:
+            match.restore(kickoff)
+    cases["match.step"] = tick
+
+    # Rendering a match frame (dirty rects) and a full redraw
+    game = main.Game(seed=0)
+    game.ui.selected_player, game.ui.selected_difficulty = "Balanced", "Medium"
+    game.setup_game()
+    game.input_source = ChaseInput()
+    for _ in range(120):
+        game.update()
+    game.render()
+    cases["game.render"] = game.render
+
+    def render_full():
+        game.full_redraw = True
+        game.render()
+    cases["game.render[full]"] = render_full
+    return cases
+
+
+def measure(op, repeats=5, alloc_samples=200):
+    """ns per call (best of repeats), peak bytes allocated per call and net blocks per call"""
+    timer = timeit.Timer(op)
+    number, _ = timer.autorange()
+    ns_per_op = min(timer.repeat(repeats, number)) / number * 1e9
+
+    # Allocations are measured separately, since tracing slows every call down
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(alloc_samples):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        op()
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    blocks = sys.getallocatedblocks()
+    for _ in range(alloc_samples):
+        op()
+    blocks = sys.getallocatedblocks() - blocks
+
+    return {
+        "ns_per_op": ns_per_op,
+        "alloc_bytes_per_op": peak_total / alloc_samples,
+        "net_blocks_per_op": blocks / alloc_samples,
+    }
+
+
+def bench_micro():
+    """Time each physics, AI and rendering hot path"""
+    import pygame
+
+    cases = micro_cases()
+    results = {}
+    lines = [f"{'Case':<40} {'ns/op':>12} {'alloc B/op':>11} {'blocks/op':>10}"]
+    for name, op in cases.items():
+        results[name] = measure(op)
+    for name, result in results.items():
+        lines.append(f"{name:<40} {result['ns_per_op']:>12,.0f} {result['alloc_bytes_per_op']:>11,.0f} "
+                     f"{result['net_blocks_per_op']:>10.2f}")
+    pygame.quit()
+    return {"cases": results, "summary": "\n" + "\n".join(lines)}
+
+
+def save_baseline(path, cases):
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "cases": cases,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def compare_baseline(path, cases, threshold):
+    """Print the change against a saved baseline; returns the regressed case names"""
+    with open(path) as f:
+        baseline = json.load(f)["cases"]
+    regressions = []
+    print(f"\n{'Case':<40} {'baseline ns':>12} {'now ns':>12} {'change':>8}")
+    for name, result in cases.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>12} {result['ns_per_op']:>12,.0f}      new")
+            continue
+        before = baseline[name]["ns_per_op"]
+        change = result["ns_per_op"] / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {before:>12,.0f} {result['ns_per_op']:>12,.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+BENCHMARKS = {
+    "simulation": bench_simulation,
+    "batch": bench_batch_physics,
+    "particles": bench_particles,
+    "hud": bench_hud,
+    "menu": bench_menu,
+    "assets": bench_assets,
+    "entities": bench_entities,
+    "fork": bench_fork,
+    "search": bench_search,
+    "worker": bench_planner_worker,
+    "micro": bench_micro,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Head Football benchmarks")
+    parser.add_argument("benchmarks", nargs="*", metavar="name",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--save-baseline", metavar="FILE", help="save the micro results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the micro results with a baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="slowdown that counts as a regression (default: 0.15 = 15%%)")
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    names = args.benchmarks or list(BENCHMARKS)
+    if (args.save_baseline or args.compare) and "micro" not in names:
+        names.append("micro")
+
+    results = {}
+    for name in names:
+        results[name] = BENCHMARKS[name]()
+        print(f"{name}: {results[name]['summary']}")
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results["micro"]["cases"])
+        print(f"Saved baseline to {args.save_baseline}")
+    if args.compare:
+        regressions = compare_baseline(args.compare, results["micro"]["cases"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Build step that packs the game's images into one texture atlas.
+
+Every player sprite, head, preview, goal and background is scaled to the size
+the game draws it at and packed into a single uncompressed RGBA image, which
+assets.py memory-maps at startup instead of decoding each PNG. Run it from
+the head_football directory after changing any image (create_sprites.py,
+create_background.py); stale entries are skipped at load time until then:
+    python build_atlas.py
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from config import ATLAS_FILE
+from assets import ATLAS_HEADER, ATLAS_MAGIC, ATLAS_VERSION, game_images, pixel_offset, source_stamp
+
+
+def pack(sizes, min_width=0):
+    """Shelf-pack rectangles, tallest first; returns positions and atlas size"""
+    width = max([min_width] + [w for w, _ in sizes])
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return positions, (width, y + shelf_height)
+
+
+def build_atlas(path=ATLAS_FILE):
+    """Scale, pack and write every atlas entry; returns the index"""
+    entries = game_images()
+    images = {}
+    for source, size in entries:
+        if source not in images:
+            images[source] = pygame.image.load(source)
+
+    # Same scaling as AssetManager.get, so the packed pixels are identical
+    scaled = []
+    for source, size in entries:
+        image = images[source]
+        scaled.append(image if image.get_size() == size else pygame.transform.scale(image, size))
+
+    positions, atlas_size = pack([size for _, size in entries])
+    atlas = pygame.Surface(atlas_size, pygame.SRCALPHA)
+    index = []
+    for (source, size), image, (x, y) in zip(entries, scaled, positions):
+        atlas.blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        index.append([source, size[0], size[1], x, y, *source_stamp(source)])
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    header = ATLAS_HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, atlas_size[0], atlas_size[1], len(index_bytes))
+    padding = pixel_offset(len(index_bytes)) - len(header) - len(index_bytes)
+    with open(path, "wb") as f:
+        f.write(header + index_bytes + b"\0" * padding)
+        f.write(pygame.image.tobytes(atlas, "RGBA"))
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the Head Football images into a texture atlas")
+    parser.add_argument("--output", default=ATLAS_FILE, help="atlas file to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = build_atlas(args.output)
+    print(f"Packed {len(index)} images into {args.output} "
+          f"({os.path.getsize(args.output) / 1024:.0f} KiB) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,15 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Fixed-timestep loop: physics always advances in 1/SIM_FPS steps (the game
+# physics is tuned per tick at 60 Hz, so SIM_FPS must stay at FPS; main.py
+# rejects any other --sim-fps), while drawing is capped at RENDER_FPS
+# (0 = uncapped). When rendering falls behind, up to MAX_SIM_STEPS_PER_FRAME
+# physics steps run per frame before the remaining backlog is dropped.
+SIM_FPS = FPS
+RENDER_FPS = FPS
+MAX_SIM_STEPS_PER_FRAME = 5
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -30,6 +39,55 @@ UI_DIR = ASSETS_DIR + "ui/"
 BALL_IMG = ASSETS_DIR + "ball.png"
 BACKGROUND_IMG = ASSETS_DIR + "background.png"
 GOAL_IMG = ASSETS_DIR + "goal.png"
+BACKGROUND_DIR = ASSETS_DIR + "background/"
+
+# Sizes images are drawn at (also the variants packed into the atlas)
+PLAYER_SPRITE_SIZE = (50, 100)
+HEAD_SPRITE_SIZE = (30, 30)
+PREVIEW_SIZE = (80, 160)
+
+# Prebuilt texture atlas (python build_atlas.py); used instead of the PNGs
+# when present and up to date
+ATLAS_FILE = ASSETS_DIR + "atlas.bin"
+
+# Scaled images not in the atlas are cached here between launches
+DERIVED_CACHE_DIR = ASSETS_DIR + ".cache/"
+
+# Threads decoding images in the background at startup
+ASSET_LOADER_WORKERS = 4
+
+# System font files resolved by earlier launches (skips the font scan)
+FONT_CACHE_FILE = DERIVED_CACHE_DIR + "fonts.json"
+
+# Fast start only initializes the display, font and event subsystems; the
+# game uses no others (initialize e.g. pygame.mixer where it's first needed)
+FAST_START = True
+
+# During a match only the screen areas that changed are redrawn and sent to
+# the display; a full flip is used when they cover more than this fraction
+DIRTY_RECT_RENDERING = True
+DIRTY_RECT_MAX_FRACTION = 0.4
+
+# Frame-time profiler (F3 shows the overlay, F4 exports CSV here)
+PROFILER_FRAMES = 600
+PROFILE_DIR = "profiles/"
+
+# Game events (collisions, jumps, goals...) are recorded at this level
+# ("off", "info" or "debug") and written to TELEMETRY_FILE; see telemetry.py
+TELEMETRY_LEVEL = "off"
+TELEMETRY_FILE = "telemetry/events.jsonl"
+
+# Particle effects: pool size and confetti pieces per goal
+PARTICLE_CAPACITY = 4096
+CELEBRATION_PARTICLES = 100
+
+# A planning AI (the Expert difficulty) searches in a worker process instead
+# of inside the game loop, so its search doesn't lengthen frames
+BACKGROUND_PLANNER = True
+
+# Every finished match is saved here as a compact replay (see replay.py)
+SAVE_REPLAYS = True
+REPLAY_DIR = "replays/"
 
 # Use placeholder images if actual images don't exist
 USE_PLACEHOLDER_GRAPHICS = False
@@ -97,6 +155,16 @@ DIFFICULTY_SETTINGS = {
         "accuracy": 0.95,
         "speed_factor": 1.0,
         "jump_probability": 0.9
+    },
+    "Expert": {
+        "reaction_time": 0.05,  # how long each planned move lags the state it was planned from
+        "accuracy": 0.95,
+        "speed_factor": 1.0,
+        "jump_probability": 0.9,
+        "planner": "mcts",  # plans its moves by searching ahead (see search.py)
+        "search_budget_ms": 4.0,  # CPU time the search may use per frame
+        "action_ticks": 6,  # ticks each planned move is held
+        "rollout_actions": 3  # random moves played out past the search tree
     }
 }
 
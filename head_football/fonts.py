@@ -0,0 +1,79 @@
+"""
+Shared font registry for the Head Football game.
+
+pygame.font.SysFont searches the system font list and opens the font file
+every time it is called, so fonts are resolved once here and shared by every
+screen in the process.
+
+Building the system font list (fc-list on Linux) is the slow part of the
+first SysFont call, so the font file each request resolved to is also saved
+in FONT_CACHE_FILE and reused on later launches without the scan.
+"""
+import json
+import os
+import pygame
+from pygame.sysfont import font_constructor
+from config import FONT_CACHE_FILE
+
+_fonts = {}
+_resolved = None
+
+
+def _load_resolved():
+    """Font files found by earlier launches: key -> [path, set_bold, set_italic]"""
+    global _resolved
+    if _resolved is None:
+        try:
+            with open(FONT_CACHE_FILE) as f:
+                _resolved = json.load(f)
+        except (OSError, ValueError):
+            _resolved = {}
+    return _resolved
+
+
+def _save_resolved():
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, "w") as f:
+            json.dump(_resolved, f)
+    except OSError as e:
+        print(f"Could not save font cache: {e}")
+
+
+def _resolve(name, size, bold, italic):
+    """Load a system font, skipping the font scan if its file is already known"""
+    resolved = _load_resolved()
+    key = f"{name}|{int(bold)}|{int(italic)}"
+    if key in resolved:
+        path, set_bold, set_italic = resolved[key]
+        if path is None or os.path.exists(path):
+            return font_constructor(path, size, set_bold, set_italic)
+
+    # Let SysFont do the matching, and remember what it picked
+    picked = []
+
+    def constructor(path, size, set_bold, set_italic):
+        picked.append([path, set_bold, set_italic])
+        return font_constructor(path, size, set_bold, set_italic)
+
+    font = pygame.font.SysFont(name, size, bold=bold, italic=italic, constructor=constructor)
+    resolved[key] = picked[0]
+    _save_resolved()
+    return font
+
+
+def get_font(name, size, bold=False, italic=False):
+    """Return the system font, loading it on first use"""
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _resolve(name, size, bold, italic)
+        _fonts[key] = font
+    return font
+
+
+def clear():
+    """Forget every loaded font (needed after pygame.font.quit())"""
+    _fonts.clear()
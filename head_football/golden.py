@@ -0,0 +1,380 @@
+"""
+Golden-trajectory determinism check for Head Football.
+
+A fixed library of seeded, scripted matches (SCENARIOS) is stepped tick by
+tick, and after every tick each field of the match state (score, clock,
+random stream, ball, both players) is reduced to a small digest. --record
+stores the inputs and the per-tick digests in GOLDEN_FILE; the default check
+replays the recorded inputs through the current engine and reports the first
+tick and field that differ. Every scenario is then played again, switching
+to a Match.fork() every FORK_EVERY ticks, to check that forks used for
+lookahead play on exactly like the match they were taken from. Run it before
+committing any change to the physics, so speedups to Ball, Player or
+AIOpponent are known to leave gameplay bit-for-bit unchanged:
+    python golden.py                          # check against the stored trajectories
+    python golden.py --record                 # after an intended gameplay change
+    python golden.py --engine fast_match:FastMatch
+
+An alternative engine is any class constructed like simulation.Match with
+step(), fork() and snapshot() returning the same layout (--fork-every 0 skips
+the fork pass). The default check then makes sure seeking a replay past its
+end raises ReplayError, and finally steps batch_physics against the scalar
+classes (verify_against_scalar); --skip-batch leaves that out.
+
+File layout (little endian):
+    b"HFGT", u8 version
+    u32 length + JSON header (scenarios with their field names and tick counts)
+    per scenario: u32 length + zlib-compressed data, which is one input byte
+    per tick (replay.pack_inputs) followed by one u32 state hash and one u8
+    digest per field for every tick
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from config import PLAYER_PROFILES, DIFFICULTY_SETTINGS, GAME_TIME, FPS
+from simulation import Match, ChaseInput, IdleInput
+from ball import Ball
+from player import Player
+from ai import AIOpponent
+from replay import (LEFT, RIGHT, JUMP, HEAD, pack_inputs, unpack_inputs, encode_state, decode_state,
+                    ReplayRecorder, Replay, ReplayError)
+
+GOLDEN_FILE = "golden/trajectories.hfg"
+MAGIC = b"HFGT"
+VERSION = 1
+
+# Field names of Match.snapshot(), flattened
+MATCH_FIELDS = ("frame", "player_score", "ai_score", "goal_cooldown", "reset_pending",
+                "reset_timer", "game_time", "finished", "rng")
+BALL_FIELDS = Ball.STATE
+PLAYER_FIELDS = Player.STATE
+AI_FIELDS = AIOpponent.STATE
+
+Scenario = namedtuple("Scenario", ["name", "player_profile", "ai_profile", "difficulty",
+                                   "player_difficulty", "seed", "ticks", "script"])
+
+# Between them these cover running, jumping, headers, body collisions, goals,
+# kickoff resets, celebrations, every difficulty and a full-length match.
+SCENARIOS = (
+    Scenario("chase_medium", "Balanced", "Speedy", "Medium", None, 1, 1800, "chase"),
+    Scenario("random_hard", "Powerful", "Jumper", "Hard", None, 2, 1800, "random"),
+    Scenario("random_easy", "Technical", "Balanced", "Easy", None, 3, 1800, "random"),
+    Scenario("idle_hard", "Speedy", "Powerful", "Hard", None, 4, 1800, "idle"),
+    Scenario("ai_vs_ai", "Jumper", "Technical", "Hard", "Medium", 5, 1800, None),
+    Scenario("full_match", "Balanced", "Balanced", "Medium", None, 6, GAME_TIME * FPS, "chase"),
+)
+
+STATE_HASH = struct.Struct("<I")
+
+# The default check also plays every scenario again, forking this often
+FORK_EVERY = 37
+
+# What the AI of a reused fork is left holding before fork(into=...)
+STALE_COMMAND = unpack_inputs(RIGHT | JUMP | HEAD)
+
+# ...records a replay this long to check seeking stays inside it...
+REPLAY_TICKS = 300
+
+# ...and steps this many batch_physics lanes for this many ticks
+BATCH_LANES = 16
+BATCH_TICKS = 300
+
+
+class RandomInput:
+    """Mash the controls, holding each combination for a few ticks"""
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.held = 0
+        self.state = None
+
+    def read(self, match):
+        if self.held <= 0:
+            self.held = self.random.randint(1, 20)
+            # Any jump/head combination, with at most one direction
+            direction = self.random.choice((0, LEFT, RIGHT))
+            self.state = unpack_inputs(direction | self.random.choice((0, JUMP)) | self.random.choice((0, HEAD)))
+        self.held -= 1
+        return self.state
+
+
+SCRIPTS = {
+    "chase": lambda seed: ChaseInput(),
+    "random": RandomInput,
+    "idle": lambda seed: IdleInput(),
+    None: lambda seed: IdleInput(),
+}
+
+
+class Divergence(Exception):
+    """Raised when an engine leaves a golden trajectory"""
+    def __init__(self, scenario, tick, field, previous, value):
+        self.scenario = scenario
+        self.tick = tick
+        self.field = field
+        self.previous = previous
+        self.value = value
+        super().__init__(f"{scenario}: first diverged at tick {tick} in {field} "
+                         f"({previous!r} at tick {tick - 1}, now {value!r})")
+
+
+def field_names(match):
+    """Names of the values returned by state_values, e.g. "ball.vel_x" """
+    player_fields = AI_FIELDS if match.player_is_ai else PLAYER_FIELDS
+    return ([f"match.{name}" for name in MATCH_FIELDS] +
+            [f"ball.{name}" for name in BALL_FIELDS] +
+            [f"player.{name}" for name in player_fields] +
+            [f"ai.{name}" for name in AI_FIELDS])
+
+
+def state_values(match):
+    """Match.snapshot() flattened to one value per field"""
+    state = match.snapshot()
+    ball = state[9]
+    last = ball[5]
+    last = None if last is None else "player" if last is match.player else "ai"
+    return state[:9] + ball[:5] + (last,) + ball[6:] + state[10] + state[11]
+
+
+def canonical(value):
+    """Bytes for a value that don't depend on its type (1 == 1.0 == True, NumPy scalars)"""
+    if value is None or isinstance(value, str):
+        return repr(value).encode()
+    if isinstance(value, tuple):
+        return b",".join(canonical(item) for item in value)
+    if int(value) == value:
+        return str(int(value)).encode()
+    return float(value).hex().encode()
+
+
+def digest_tick(match):
+    """The state hash and per-field digests after a tick, plus the values"""
+    values = state_values(match)
+    encoded = [canonical(value) for value in values]
+    return (zlib.crc32(b"|".join(encoded)), bytes(zlib.crc32(item) & 0xFF for item in encoded), values)
+
+
+def new_match(scenario, engine=Match):
+    player_difficulty = scenario.player_difficulty
+    return engine(PLAYER_PROFILES[scenario.player_profile], PLAYER_PROFILES[scenario.ai_profile],
+                  DIFFICULTY_SETTINGS[scenario.difficulty],
+                  player_difficulty=DIFFICULTY_SETTINGS[player_difficulty] if player_difficulty else None,
+                  seed=scenario.seed)
+
+
+def record_scenario(scenario):
+    """Play a scenario with its scripted input; returns (fields, inputs, hashes)"""
+    match = new_match(scenario)
+    source = SCRIPTS[scenario.script](scenario.seed)
+    inputs = bytearray()
+    hashes = []
+    while match.frame < scenario.ticks and not match.finished:
+        state = source.read(match)
+        match.step(state)
+        inputs.append(pack_inputs(state))
+        state_hash, fields, _ = digest_tick(match)
+        hashes.append((state_hash, fields))
+    return field_names(match), bytes(inputs), hashes
+
+
+def check_scenario(scenario, fields, inputs, hashes, engine=Match, fork_every=0):
+    """Replay recorded inputs through engine; raises Divergence at the first difference.
+
+    With fork_every, play continues on a Match.fork() of the match every
+    fork_every ticks (alternating fresh forks and fork(into=...), the reused
+    ones first left with a stale AI command), so forks must carry on exactly
+    like the match they came from. Every third time the spare is restored
+    from encode_state bytes instead, as a BackgroundPlanner's worker restores
+    the state published between two ticks.
+    """
+    match = new_match(scenario, engine)
+    spare = None
+    names = field_names(match)
+    if names != fields:
+        raise Divergence(scenario.name, 0, "state layout", fields, names)
+    previous = state_values(match)
+    for tick, (bits, (state_hash, digests)) in enumerate(zip(inputs, hashes), 1):
+        if fork_every and tick % fork_every == 0:
+            if spare is not None and tick // fork_every % 3 == 0:
+                decode_state(spare, encode_state(match))
+                spare, match = match, spare
+            elif spare is not None:
+                # Leave a stale command and decisions on the reused fork,
+                # which fork(into=...) must overwrite
+                for ai in (spare.player, spare.ai_opponent) if spare.player_is_ai else (spare.ai_opponent,):
+                    ai.command = STALE_COMMAND
+                    ai.decided_jump = ai.decided_head = True
+                spare, match = match, match.fork(into=spare)
+            else:
+                spare, match = match, match.fork()
+        match.step(unpack_inputs(bits))
+        actual_hash, actual_digests, values = digest_tick(match)
+        if actual_hash != state_hash:
+            mismatched = [i for i, (a, b) in enumerate(zip(digests, actual_digests)) if a != b]
+            # Digests are only one byte, so fall back to naming the whole state
+            if mismatched:
+                i = mismatched[0]
+                raise Divergence(scenario.name, tick, names[i], previous[i], values[i])
+            raise Divergence(scenario.name, tick, "state", previous, values)
+        previous = values
+    return len(inputs)
+
+
+def check_replay_bounds(scenario=SCENARIOS[0], ticks=REPLAY_TICKS):
+    """Seeking past the end of a replay, or past the end of its match, must raise ReplayError.
+
+    Returns a list of failure messages (a regression here would usually hang
+    instead, as a finished match never reaches a later tick).
+    """
+    match = new_match(scenario)
+    recorder = ReplayRecorder(match, PLAYER_PROFILES[scenario.player_profile],
+                              PLAYER_PROFILES[scenario.ai_profile], DIFFICULTY_SETTINGS[scenario.difficulty])
+    source = SCRIPTS[scenario.script](scenario.seed)
+    while match.frame < ticks:
+        inputs = source.read(match)
+        match.step(inputs)
+        recorder.record(inputs)
+    replay = Replay.from_bytes(recorder.to_bytes())
+
+    failures = []
+    for tick in (-1, ticks + 1):
+        try:
+            replay.seek(tick)
+            failures.append(f"replay: seeking to tick {tick} of {ticks} didn't raise ReplayError")
+        except ReplayError:
+            pass
+
+    # A match that ends before the recorded ticks do
+    ended = replay.seek(ticks // 2)
+    ended.finished = True
+    try:
+        replay.play(ended)
+        failures.append("replay: playing on from a finished match didn't raise ReplayError")
+    except ReplayError:
+        pass
+    if replay.play(ended, verify=False).frame != ticks // 2:
+        failures.append("replay: an unverified play stepped a finished match")
+    return failures
+
+
+def save(path, recorded):
+    """Write {scenario: (fields, inputs, hashes)} to a golden file"""
+    header = {"version": VERSION, "scenarios": []}
+    blobs = []
+    for scenario in SCENARIOS:
+        fields, inputs, hashes = recorded[scenario.name]
+        header["scenarios"].append({**scenario._asdict(), "fields": fields, "recorded_ticks": len(inputs)})
+        data = inputs + b"".join(STATE_HASH.pack(state_hash) + digests for state_hash, digests in hashes)
+        blobs.append(zlib.compress(data, 9))
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<BI", VERSION, len(header_bytes)) + header_bytes)
+        for blob in blobs:
+            f.write(struct.pack("<I", len(blob)) + blob)
+
+
+def load(path):
+    """Read a golden file; returns [(Scenario, fields, inputs, hashes)]"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a golden trajectory file")
+    version, header_length = struct.unpack_from("<BI", data, 4)
+    if version != VERSION:
+        raise ValueError(f"unsupported golden file version {version}")
+    offset = 9
+    header = json.loads(data[offset:offset + header_length].decode("utf-8"))
+    offset += header_length
+
+    scenarios = []
+    for info in header["scenarios"]:
+        (length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        blob = zlib.decompress(data[offset:offset + length])
+        offset += length
+        fields = info.pop("fields")
+        ticks = info.pop("recorded_ticks")
+        row = STATE_HASH.size + len(fields)
+        hashes = [(STATE_HASH.unpack_from(blob, ticks + i * row)[0],
+                   blob[ticks + i * row + STATE_HASH.size:ticks + (i + 1) * row])
+                  for i in range(ticks)]
+        scenarios.append((Scenario(**info), fields, blob[:ticks], hashes))
+    return scenarios
+
+
+def check(path=GOLDEN_FILE, engine=Match, fork_every=0):
+    """Check every stored scenario; returns the list of Divergence errors"""
+    failures = []
+    for scenario, fields, inputs, hashes in load(path):
+        try:
+            check_scenario(scenario, fields, inputs, hashes, engine, fork_every)
+        except Divergence as e:
+            failures.append(e)
+    return failures
+
+
+def load_engine(spec):
+    """Import "module:Class" """
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name or "Match")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the physics against the golden trajectories")
+    parser.add_argument("--record", action="store_true", help="re-record the golden trajectories")
+    parser.add_argument("--file", default=GOLDEN_FILE, help="golden trajectory file")
+    parser.add_argument("--engine", default="simulation:Match", help="engine to check, as module:Class")
+    parser.add_argument("--fork-every", type=int, default=FORK_EVERY,
+                        help="also check play continued on Match.fork() every N ticks (0 = don't)")
+    parser.add_argument("--skip-batch", action="store_true",
+                        help="don't check the NumPy batch engine against the scalar classes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.record:
+        recorded = {scenario.name: record_scenario(scenario) for scenario in SCENARIOS}
+        save(args.file, recorded)
+        ticks = sum(len(inputs) for _, inputs, _ in recorded.values())
+        print(f"Recorded {len(SCENARIOS)} scenarios ({ticks} ticks) to {args.file} "
+              f"({os.path.getsize(args.file) / 1024:.0f} KiB) in {time.perf_counter() - start:.2f}s")
+        return
+
+    engine = load_engine(args.engine)
+    failures = check(args.file, engine)
+    if args.fork_every and not failures:
+        failures = [Divergence(f"{e.scenario} (forked every {args.fork_every} ticks)", e.tick, e.field,
+                               e.previous, e.value)
+                    for e in check(args.file, engine, args.fork_every)]
+    if not failures:
+        failures = check_replay_bounds()
+    if not args.skip_batch and not failures:
+        from batch_physics import verify_against_scalar, BatchDivergence
+        try:
+            verify_against_scalar(lanes=BATCH_LANES, ticks=BATCH_TICKS)
+        except BatchDivergence as e:
+            failures.append(f"batch_physics: {e}")
+    elapsed = time.perf_counter() - start
+    for failure in failures:
+        print(failure)
+    if failures:
+        print(f"{len(failures)} check(s) failed ({elapsed:.2f}s)")
+        sys.exit(1)
+    batch = "" if args.skip_batch else ", and batch_physics matches the scalar classes"
+    print(f"All scenarios match the golden trajectories{batch} ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,54 @@
 """
 Main game file for Head Football.
 """
+import time
+
+# Start of the startup profile (see StartupProfile)
+STARTUP_START = time.perf_counter()
+
 import pygame
 import os
 import sys
 import random
 import math
+import argparse
 from config import *
-from player import Player
-from ai import AIOpponent
-from ball import Ball
 from ui import UI
+from fonts import get_font
+from assets import assets, game_images
+from simulation import Match, KeyboardInput
+from replay import ReplayRecorder
+from particles import ParticleSystem
+from profiler import FrameProfiler, timestamp_path
+import telemetry
+
+def init_pygame(fast_start=FAST_START):
+    """Initialize pygame, or only the subsystems the game needs for fast start"""
+    if fast_start:
+        # The event subsystem comes up with the display
+        pygame.display.init()
+        pygame.font.init()
+    else:
+        pygame.init()
+    pygame.display.set_caption("Head Football")
 
-# Initialize pygame
-pygame.init()
-pygame.display.set_caption("Head Football")
+class StartupProfile:
+    """Wall-clock time of each startup phase, up to the first frame on screen"""
+    def __init__(self, start=STARTUP_START):
+        self.start = start
+        self.last = start
+        self.phases = []
+        
+    def mark(self, phase):
+        """End the current phase"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+        
+    def format(self):
+        lines = [f"{phase:<12} {seconds * 1000:>8.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"{'total':<12} {(self.last - self.start) * 1000:>8.1f} ms")
+        return "\n".join(lines)
 
 class Goal(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, is_left=True):
@@ -44,27 +78,66 @@ class ImageGoal(Goal):
         self.rect.y = y
 
 class Game:
-    def __init__(self):
+    def __init__(self, sim_fps=SIM_FPS, render_fps=RENDER_FPS, seed=None, fast_start=FAST_START,
+                 profile=None, background_planner=BACKGROUND_PLANNER):
+        # Optional StartupProfile, printed once the first frame is up
+        self.profile = profile
+        if profile:
+            profile.mark("import")
+        
+        init_pygame(fast_start)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if profile:
+            profile.mark("init")
         self.clock = pygame.time.Clock()
         self.running = True
+        
+        # Fixed-timestep loop settings (see run)
+        self.sim_fps = sim_fps
+        self.render_fps = render_fps
+        self.sim_dt = 1.0 / sim_fps
+        self.accumulator = 0.0
+        
+        # Seeds every match (AI profile choice, match RNG and celebration effects)
+        self.rng = random.Random(seed)
+        
+        # Whether a planning AI searches in a worker process (planner_worker.py)
+        self.background_planner = background_planner
+        
+        # Dirty-rectangle rendering state for the match screen
+        self.static_background = None
+        self.dirty_rects = []
+        self.hud_version = None
+        self.full_redraw = True
+        self.update_rects = None
+        
+        # Frame-time profiler overlay (toggled with F3)
+        self.profiler = FrameProfiler(capacity=PROFILER_FRAMES, target_fps=render_fps)
+        
+        # Confetti and other particle effects, created with the first match
+        self.particles = None
+        self.celebration_time = 0
         self.state = MENU
         
-        # Load background assets
+        # Load every image in the background so the menu shows up right away;
+        # the stadium, field and goals are picked up once they're ready
         self.stadium_bg = None
         self.field_bg = None
         self.goal_left_img = None
         self.goal_right_img = None
-        self.load_background_assets()
+        self.loader = assets.preload(game_images(), workers=ASSET_LOADER_WORKERS)
+        if self.loader.done:
+            self.load_background_assets()
         
-        # Fallback background if assets couldn't be loaded
-        if not self.stadium_bg:
-            self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.background.fill(SKY_BLUE)
-            # Draw ground
-            pygame.draw.rect(self.background, GREEN, (0, GROUND_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_HEIGHT))
+        # Fallback background while loading, or if assets couldn't be loaded
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.background.fill(SKY_BLUE)
+        # Draw ground
+        pygame.draw.rect(self.background, GREEN, (0, GROUND_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_HEIGHT))
         
         # Game objects
+        self.match = None
+        self.input_source = KeyboardInput()
         self.player = None
         self.ai_opponent = None
         self.ball = None
@@ -75,49 +148,48 @@ class Game:
         self.player_score = 0
         self.ai_score = 0
         self.game_time = GAME_TIME
-        self.start_time = 0
-        
-        # Goal cooldown to prevent multiple goals
-        self.goal_cooldown = 0
         
         # UI
         self.ui = UI()
+        self.credits_footer = self.render_credits_footer()
         
         # Selected options
         self.selected_player = "Balanced"
         self.selected_difficulty = "Medium"
+        
+        if profile:
+            profile.mark("setup")
     
     def load_background_assets(self):
         """Load background assets if they exist"""
-        try:
-            # Load stadium background
-            if os.path.exists("assets/background/stadium.png"):
-                self.stadium_bg = pygame.image.load("assets/background/stadium.png").convert_alpha()
-                self.stadium_bg = pygame.transform.scale(self.stadium_bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                print("Loaded stadium background")
-            
-            # Load field
-            if os.path.exists("assets/background/field.png"):
-                self.field_bg = pygame.image.load("assets/background/field.png").convert_alpha()
-                self.field_bg = pygame.transform.scale(self.field_bg, (SCREEN_WIDTH, 200))
-                print("Loaded field background")
-            
-            # Load goal posts
-            if os.path.exists("assets/background/goal_left.png"):
-                self.goal_left_img = pygame.image.load("assets/background/goal_left.png").convert_alpha()
-                self.goal_left_img = pygame.transform.scale(self.goal_left_img, (GOAL_WIDTH, GOAL_HEIGHT))
-                print("Loaded left goal image")
-            
-            if os.path.exists("assets/background/goal_right.png"):
-                self.goal_right_img = pygame.image.load("assets/background/goal_right.png").convert_alpha()
-                self.goal_right_img = pygame.transform.scale(self.goal_right_img, (GOAL_WIDTH, GOAL_HEIGHT))
-                print("Loaded right goal image")
-        except Exception as e:
-            print(f"Error loading background assets: {e}")
-            self.stadium_bg = None
-            self.field_bg = None
-            self.goal_left_img = None
-            self.goal_right_img = None
+        # Load stadium background
+        self.stadium_bg = assets.get(BACKGROUND_DIR + "stadium.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
+        if self.stadium_bg:
+            print("Loaded stadium background")
+        
+        # Load field
+        self.field_bg = assets.get(BACKGROUND_DIR + "field.png", (SCREEN_WIDTH, 200))
+        if self.field_bg:
+            print("Loaded field background")
+        
+        # Load goal posts
+        self.goal_left_img = assets.get(BACKGROUND_DIR + "goal_left.png", (GOAL_WIDTH, GOAL_HEIGHT))
+        if self.goal_left_img:
+            print("Loaded left goal image")
+        
+        self.goal_right_img = assets.get(BACKGROUND_DIR + "goal_right.png", (GOAL_WIDTH, GOAL_HEIGHT))
+        if self.goal_right_img:
+            print("Loaded right goal image")
+    
+    def poll_loading(self, wait=False):
+        """Finish images the background loader has ready (or all of them, if wait)"""
+        if self.loader.done:
+            return
+        if wait:
+            self.loader.wait()
+        if self.loader.poll():
+            self.load_background_assets()
+            self.static_background = None
     
     def fix_goal_positions(self):
         """Ensure goals are at the correct fixed position"""
@@ -142,11 +214,12 @@ class Game:
         self.goal_area_y = goal_area_y
     
     def setup_game(self):
-        # Create player
+        # A match needs the goal images and player sprites
+        self.poll_loading(wait=True)
+        
         player_profile = PLAYER_PROFILES[self.selected_player]
-        self.player = Player(SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, player_profile, is_player=True)
         
-        # Create AI opponent with different color than player
+        # Pick AI opponent with different color than player
         # Get all available profiles
         available_profiles = list(PLAYER_PROFILES.values())
         
@@ -156,19 +229,36 @@ class Game:
         
         # If all profiles have the same color (unlikely), modify one slightly
         if not different_color_profiles:
-            ai_profile = random.choice(available_profiles)
+            ai_profile = self.rng.choice(available_profiles)
             # Modify the color slightly to make it different
             r, g, b = ai_profile["color"]
             ai_profile = ai_profile.copy()  # Create a copy to avoid modifying the original
             ai_profile["color"] = ((r + 100) % 256, (g + 100) % 256, (b + 100) % 256)
         else:
-            ai_profile = random.choice(different_color_profiles)
-        
-        self.ai_opponent = AIOpponent(3 * SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, ai_profile, 
-                             difficulty=DIFFICULTY_SETTINGS[self.selected_difficulty])
-        
-        # Create ball
-        self.ball = Ball(SCREEN_WIDTH // 2, GROUND_HEIGHT - 200)
+            ai_profile = self.rng.choice(different_color_profiles)
+        
+        # Create the match (players, ball, score and clock). The match clock
+        # counts simulation ticks, so a lagging renderer can't shorten the game.
+        if self.match is not None:
+            self.match.close()
+        self.match = Match(player_profile, ai_profile, DIFFICULTY_SETTINGS[self.selected_difficulty],
+                           tick_rate=self.sim_fps, seed=self.rng.getrandbits(64),
+                           background_planner=self.background_planner)
+        
+        # Effects get their own stream so drawing confetti never changes the match
+        if self.particles is None:
+            self.particles = ParticleSystem(capacity=PARTICLE_CAPACITY)
+            self.particles.convert()
+        self.particles.reseed(self.match.seed ^ 0x5EED)
+        self.particles.clear()
+        self.celebration_time = 0
+        
+        # Record the match so it can be replayed later
+        self.recorder = ReplayRecorder(self.match, player_profile, ai_profile,
+                                       DIFFICULTY_SETTINGS[self.selected_difficulty])
+        self.player = self.match.player
+        self.ai_opponent = self.match.ai_opponent
+        self.ball = self.match.ball
         
         # Create goals
         goal_y = GROUND_HEIGHT - GOAL_HEIGHT - 30  # Position goals 30 pixels higher
@@ -188,13 +278,11 @@ class Game:
         self.player_score = 0
         self.ai_score = 0
         self.game_time = GAME_TIME
-        self.start_time = pygame.time.get_ticks()
-        
-        # Reset goal cooldown
-        self.goal_cooldown = 0
         
-        # Change state to playing
+        # Change state to playing; the first match frame is drawn in full
         self.state = PLAYING
+        self.static_background = None
+        self.full_redraw = True
     
     def reset_ball(self):
         """Reset the ball to the center of the field"""
@@ -203,55 +291,8 @@ class Game:
         # Fix goal positions to ensure they don't move
         self.fix_goal_positions()
     
-    def check_goal(self):
-        """Check if a goal has been scored"""
-        # Skip goal check if on cooldown
-        if self.goal_cooldown > 0:
-            return False
-            
-        # Left goal (AI scores)
-        if self.ball.x < GOAL_WIDTH and self.ball.y > self.left_goal.y and self.ball.y < self.left_goal.y + GOAL_HEIGHT:
-            # Increment score by exactly 1
-            self.ai_score += 1
-            print(f"AI GOAL! Score: {self.player_score}-{self.ai_score}")
-            
-            # Create goal celebration effect
-            self.create_goal_celebration(is_left_goal=True)
-            
-            # Set a flag to reset positions after celebration
-            self.reset_pending = True
-            self.reset_timer = 60  # Reset after 60 frames (1 second at 60 FPS)
-            
-            # Set goal cooldown to prevent multiple goals
-            self.goal_cooldown = 120  # 2 seconds at 60 FPS
-            
-            return True
-        
-        # Right goal (Player scores)
-        if self.ball.x > SCREEN_WIDTH - GOAL_WIDTH and self.ball.y > self.right_goal.y and self.ball.y < self.right_goal.y + GOAL_HEIGHT:
-            # Increment score by exactly 1
-            self.player_score += 1
-            print(f"PLAYER GOAL! Score: {self.player_score}-{self.ai_score}")
-            
-            # Create goal celebration effect
-            self.create_goal_celebration(is_left_goal=False)
-            
-            # Set a flag to reset positions after celebration
-            self.reset_pending = True
-            self.reset_timer = 60  # Reset after 60 frames (1 second at 60 FPS)
-            
-            # Set goal cooldown to prevent multiple goals
-            self.goal_cooldown = 120  # 2 seconds at 60 FPS
-            
-            return True
-        
-        return False
-        
     def create_goal_celebration(self, is_left_goal):
         """Create celebration effects at the goal"""
-        # Create confetti particles
-        self.goal_particles = []
-        
         # Determine which goal to create particles for
         if is_left_goal:
             goal_x = GOAL_WIDTH // 2
@@ -260,138 +301,50 @@ class Game:
             
         goal_y = self.left_goal.y + GOAL_HEIGHT // 2
         
-        # Create 100 particles
-        for _ in range(100):
-            # Random position near the goal
-            x = goal_x + random.randint(-GOAL_WIDTH, GOAL_WIDTH)
-            y = goal_y + random.randint(-GOAL_HEIGHT//2, GOAL_HEIGHT//2)
-            
-            # Random velocity
-            vel_x = random.uniform(-5, 5)
-            vel_y = random.uniform(-8, -2)  # Upward velocity
-            
-            # Random color
-            color = (
-                random.randint(50, 255),
-                random.randint(50, 255),
-                random.randint(50, 255)
-            )
-            
-            # Random size
-            size = random.randint(3, 8)
-            
-            # Random lifetime
-            lifetime = random.randint(30, 60)  # frames
-            
-            # Add particle
-            self.goal_particles.append({
-                'x': x,
-                'y': y,
-                'vel_x': vel_x,
-                'vel_y': vel_y,
-                'color': color,
-                'size': size,
-                'lifetime': lifetime
-            })
+        # Replace any confetti left over from the previous goal
+        self.particles.clear()
+        self.particles.emit(
+            CELEBRATION_PARTICLES, goal_x, goal_y,
+            spread_x=GOAL_WIDTH, spread_y=GOAL_HEIGHT // 2,
+            vel_x=(-5, 5), vel_y=(-8, -2),  # Upward velocity
+            lifetime=(30, 60)  # frames
+        )
             
         # Set celebration time
         self.celebration_time = 60  # 1 second at 60 FPS
         
     def update_goal_celebration(self):
         """Update goal celebration particles"""
-        if hasattr(self, 'celebration_time') and self.celebration_time > 0:
+        if self.celebration_time > 0:
             self.celebration_time -= 1
-            
-            # Update particles
-            for particle in self.goal_particles[:]:
-                # Apply gravity
-                particle['vel_y'] += 0.2
-                
-                # Update position
-                particle['x'] += particle['vel_x']
-                particle['y'] += particle['vel_y']
-                
-                # Decrease lifetime
-                particle['lifetime'] -= 1
-                
-                # Remove if lifetime is over
-                if particle['lifetime'] <= 0:
-                    self.goal_particles.remove(particle)
+            self.particles.update()
                     
-    def draw_goal_celebration(self):
+    def draw_goal_celebration(self, alpha=1.0):
         """Draw goal celebration particles"""
-        if hasattr(self, 'goal_particles'):
-            for particle in self.goal_particles:
-                pygame.draw.rect(
-                    self.screen, 
-                    particle['color'], 
-                    (particle['x'], particle['y'], particle['size'], particle['size'])
-                )
-        
-    def reset_after_goal(self):
-        """Reset ball and players after a goal"""
-        # Reset ball to center
-        self.ball.reset(SCREEN_WIDTH // 2, GROUND_HEIGHT - 200)
-        
-        # Reset players to their initial positions
-        self.player.reset_position()
-        self.ai_opponent.reset_position()
+        self.particles.draw(self.screen, alpha)
         
-        # Fix goal positions to ensure they don't move
-        self.fix_goal_positions()
-    
     def update(self):
         """Update game state"""
         if self.state == PLAYING:
-            # Update goal cooldown
-            if self.goal_cooldown > 0:
-                self.goal_cooldown -= 1
-                
-            # Handle reset after goal celebration
-            if hasattr(self, 'reset_pending') and self.reset_pending:
-                self.reset_timer -= 1
-                if self.reset_timer <= 0:
-                    self.reset_after_goal()
-                    self.reset_pending = False
-            
-            # Update player
-            keys = pygame.key.get_pressed()
-            
-            # Only move when keys are pressed (not continuous)
-            if keys[pygame.K_LEFT]:
-                self.player.move_left()
-            elif keys[pygame.K_RIGHT]:
-                self.player.move_right()
-            else:
-                self.player.stop()
-                
-            if keys[pygame.K_SPACE]:
-                self.player.jump()
-            if keys[pygame.K_UP]:
-                if self.player.head():
-                    # Check for collision with the ball when heading
-                    self.ball.check_player_collision(self.player)
-            
-            # Update AI
-            self.ai_opponent.update(self.ball)
-            
-            # Check for collision with the ball for AI
-            self.ball.check_player_collision(self.ai_opponent)
-            
-            # Update ball
-            self.ball.update()
+            # Keep the pre-step positions so render can interpolate
+            self.ball.save_previous()
+            self.player.save_previous()
+            self.ai_opponent.save_previous()
+            
+            # Advance the match by one tick using the keyboard state
+            inputs = self.input_source.read(self.match)
+            scorer = self.match.step(inputs)
+            self.recorder.record(inputs)
+            self.player_score = self.match.player_score
+            self.ai_score = self.match.ai_score
+            self.game_time = self.match.game_time
             
-            # Update player
-            self.player.update()
-            
-            # Always check for collision with human player (makes it much easier to hit the ball)
-            self.ball.check_player_collision(self.player)
-            
-            # Check for goals
-            self.check_goal()
+            # Create goal celebration effect
+            if scorer:
+                self.create_goal_celebration(is_left_goal=(scorer == "ai"))
             
             # Update goal celebration if active
-            if hasattr(self, 'celebration_time') and self.celebration_time > 0:
+            if self.celebration_time > 0:
                 self.update_goal_celebration()
             
             # Only fix goal positions if they've moved from the expected position
@@ -401,17 +354,49 @@ class Game:
                     self.right_goal.y != self.goal_area_y or
                     self.right_goal.rect.y != self.goal_area_y):
                     self.fix_goal_positions()
-            
-            # Update game time
-            elapsed = (pygame.time.get_ticks() - self.start_time) // 1000
-            self.game_time = max(0, GAME_TIME - elapsed)
+                    self.static_background = None
             
             # Check for game over
-            if self.game_time <= 0 or self.player_score >= MAX_SCORE or self.ai_score >= MAX_SCORE:
+            if self.match.finished:
                 self.state = GAME_OVER
+                self.save_replay()
+                if self.match.planner is not None and telemetry.level >= telemetry.INFO:
+                    print(f"AI {self.match.planner.format_stats()}")
+                # Stop a background planner now rather than when the next match starts
+                self.match.close()
+    
+    def save_replay(self):
+        """Save the finished match to REPLAY_DIR"""
+        if not SAVE_REPLAYS:
+            return
+        path = os.path.join(REPLAY_DIR, time.strftime("match_%Y%m%d_%H%M%S.hfr"))
+        try:
+            self.recorder.save(path)
+            print(f"Saved replay to {path}")
+        except OSError as e:
+            print(f"Could not save replay: {e}")
     
     def render(self):
         """Render the game"""
+        self.draw_frame()
+        self.present()
+    
+    def present(self):
+        """Send the drawn frame to the display"""
+        if self.update_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.update_rects)
+    
+    def draw_frame(self):
+        """Draw the current state; sets update_rects to what present() must send"""
+        if self.state == PLAYING and DIRTY_RECT_RENDERING:
+            self.render_match_dirty()
+            return
+        # The match screen must be redrawn in full after any other screen
+        self.full_redraw = True
+        self.update_rects = None
+        
         # Draw background
         if self.stadium_bg:
             self.screen.blit(self.stadium_bg, (0, 0))
@@ -439,28 +424,111 @@ class Game:
             self.screen.blit(self.left_goal.image, (self.left_goal.x, self.left_goal.y))
             self.screen.blit(self.right_goal.image, (self.right_goal.x, self.right_goal.y))
             
-            # Draw players
-            self.player.draw(self.screen)
-            self.ai_opponent.draw(self.screen)
-            
-            # Draw ball
-            self.ball.draw(self.screen)
-            
-            # Draw goal celebration if active
-            if hasattr(self, 'celebration_time') and self.celebration_time > 0:
-                self.draw_goal_celebration()
-            
-            # Draw UI elements
-            self.ui.draw_game_hud(self.screen, self.player_score, self.ai_score, self.game_time)
+            self.draw_match(self.render_alpha())
         elif self.state == GAME_OVER:
             self.ui.draw_game_over(self.screen, self.player_score, self.ai_score)
             # Draw credits in game over screen
             self.draw_credits()
         
-        pygame.display.flip()
+        # Loading progress until every image is ready
+        if not self.loader.done:
+            self.ui.draw_loading_bar(self.screen, self.loader.progress)
+        
+        if self.profiler.enabled:
+            self.profiler.draw(self.screen, self.profiler_notes())
     
-    def draw_credits(self):
-        """Draw credits at the bottom of the screen"""
+    def profiler_notes(self):
+        """Extra lines for the profiler overlay"""
+        if self.state == PLAYING and self.match.planner is not None:
+            stats = self.match.planner.stats()
+            notes = [f"AI search {stats['nodes_per_second']:,.0f} nodes/s  "
+                     f"{stats['iterations_per_second']:,.0f} rollouts/s",
+                     f"AI overruns {stats['overruns']}/{stats['think_calls']}  "
+                     f"max {stats['max_think_ms']:.1f} ms"]
+            if "mean_staleness" in stats:
+                notes.append(f"AI staleness {stats['mean_staleness']:.2f} ticks  "
+                             f"max {stats['max_staleness']}  late {stats['late_ticks']}")
+            return notes
+        return []
+    
+    def render_alpha(self):
+        """How far we are into the next physics step, for interpolation"""
+        # Blend the last two physics states by how far we are into the
+        # next step, so frames drawn between steps still show movement
+        return min(self.accumulator / self.sim_dt, 1.0)
+    
+    def draw_match(self, alpha):
+        """Draw the moving parts of the match and the HUD"""
+        # Draw players
+        self.player.draw(self.screen, alpha)
+        self.ai_opponent.draw(self.screen, alpha)
+        
+        # Draw ball
+        self.ball.draw(self.screen, alpha)
+        
+        # Draw goal celebration if active
+        if self.celebration_time > 0:
+            self.draw_goal_celebration(alpha)
+        
+        # Draw UI elements
+        self.ui.draw_game_hud(self.screen, self.player_score, self.ai_score, self.game_time)
+    
+    def build_static_background(self):
+        """Compose everything that doesn't move during a match into one surface"""
+        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        background.blit(self.stadium_bg if self.stadium_bg else self.background, (0, 0))
+        if self.field_bg:
+            background.blit(self.field_bg, (0, GROUND_HEIGHT - 100))
+        background.blit(self.left_goal.image, (self.left_goal.x, self.left_goal.y))
+        background.blit(self.right_goal.image, (self.right_goal.x, self.right_goal.y))
+        return background
+    
+    def render_match_dirty(self):
+        """Render the match, updating only the screen areas that changed"""
+        if self.static_background is None:
+            self.static_background = self.build_static_background()
+            self.full_redraw = True
+        
+        alpha = self.render_alpha()
+        
+        # Where the moving elements are this frame
+        current = [self.player.bounding_rect(alpha), self.ai_opponent.bounding_rect(alpha),
+                   self.ball.bounding_rect(alpha)]
+        if self.celebration_time > 0:
+            particles = self.particles.bounding_rect(alpha)
+            if particles:
+                current.append(particles)
+        
+        if self.full_redraw:
+            self.screen.blit(self.static_background, (0, 0))
+        else:
+            # Erase last frame's elements by restoring the background under
+            # them; the HUD is always redrawn since its timer box is translucent
+            for rect in self.dirty_rects + self.ui.hud_rects():
+                self.screen.blit(self.static_background, rect, rect)
+        
+        self.draw_match(alpha)
+        if self.profiler.enabled:
+            current.append(self.profiler.draw(self.screen, self.profiler_notes()))
+        
+        # The HUD only needs sending to the display when it was re-rendered
+        changed = self.dirty_rects + current
+        if self.ui.hud.version != self.hud_version:
+            changed += self.ui.hud_rects()
+            self.hud_version = self.ui.hud.version
+        
+        screen_rect = self.screen.get_rect()
+        changed = [rect.clip(screen_rect) for rect in changed]
+        dirty_area = sum(rect.width * rect.height for rect in changed)
+        if self.full_redraw or dirty_area > DIRTY_RECT_MAX_FRACTION * screen_rect.width * screen_rect.height:
+            self.update_rects = None
+            self.full_redraw = False
+        else:
+            self.update_rects = changed
+        self.dirty_rects = current
+    
+    def render_credits_footer(self):
+        """Prerender the credits footer shown on the menu screens"""
         # Create a semi-transparent background for the credits
         footer_height = 25
         footer_y = SCREEN_HEIGHT - footer_height
@@ -470,16 +538,19 @@ class Game:
         footer_surface.fill((0, 0, 0, 150))  # Black with 60% opacity
         
         # Add text
-        font = pygame.font.SysFont('Arial', 16)
+        font = get_font('Arial', 16)
         credits_text = font.render("Made with ❤️ by Abhiram Mithur", True, (255, 255, 255))
         
         # Position text in the center of the footer
         text_x = (SCREEN_WIDTH - credits_text.get_width()) // 2
         text_y = footer_y + (footer_height - credits_text.get_height()) // 2
         
-        # Blit footer and text
-        self.screen.blit(footer_surface, (0, footer_y))
-        self.screen.blit(credits_text, (text_x, text_y))
+        return [(footer_surface.convert_alpha(), (0, footer_y)),
+                (credits_text.convert_alpha(), (text_x, text_y))]
+    
+    def draw_credits(self):
+        """Draw credits at the bottom of the screen"""
+        self.screen.blits(self.credits_footer, doreturn=False)
     
     def handle_events(self):
         """Handle pygame events"""
@@ -487,6 +558,13 @@ class Game:
             if event.type == pygame.QUIT:
                 self.running = False
             
+            # Profiler overlay and CSV export work on every screen
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and self.profiler.count:
+                path = self.profiler.export_csv(timestamp_path(PROFILE_DIR))
+                print(f"Frame times saved to {path}")
+            
             # Handle menu navigation
             if self.state == MENU:
                 button_index = self.ui.handle_menu_events(event)
@@ -512,19 +590,106 @@ class Game:
                     self.setup_game()
     
     def run(self):
-        """Main game loop"""
+        """Main game loop with a fixed simulation timestep"""
+        clock_ns = time.perf_counter_ns
+        previous = time.perf_counter()
         while self.running:
+            # Phase timings only while the profiler overlay is on
+            profiling = self.profiler.enabled
+            if profiling:
+                phases = self.profiler.current
+                start = clock_ns()
+            
+            # Bank the real time that passed since the last frame
+            now = time.perf_counter()
+            self.accumulator += now - previous
+            previous = now
+            
+            self.poll_loading()
             self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(FPS)
-        
+            if profiling:
+                mark = clock_ns()
+                phases[0] = mark - start
+                start = mark
+            
+            # Run as many fixed physics steps as that time covers, so gameplay
+            # speed doesn't depend on how fast frames are drawn
+            steps = 0
+            if self.state == PLAYING and self.match.planner is not None:
+                # A planning AI shares one search budget across this frame's steps
+                self.match.planner.begin_frame()
+            while self.accumulator >= self.sim_dt and steps < MAX_SIM_STEPS_PER_FRAME:
+                self.update()
+                self.accumulator -= self.sim_dt
+                steps += 1
+            
+            # Spiral-of-death guard: if we still can't catch up, drop the backlog
+            if self.accumulator >= self.sim_dt:
+                self.accumulator = 0.0
+            if profiling:
+                mark = clock_ns()
+                phases[1] = mark - start
+                start = mark
+            
+            self.draw_frame()
+            if profiling:
+                mark = clock_ns()
+                phases[2] = mark - start
+                start = mark
+            
+            self.present()
+            if profiling:
+                mark = clock_ns()
+                phases[3] = mark - start
+                start = mark
+            
+            if self.profile:
+                self.profile.mark("first frame")
+                print(self.profile.format())
+                self.profile = None
+            self.clock.tick(self.render_fps)
+            if profiling:
+                phases[4] = clock_ns() - start
+                self.profiler.end_frame()
+        
+        if self.match is not None:
+            self.match.close()
         pygame.quit()
         sys.exit()
 
 def main():
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Head Football")
+    parser.add_argument("--sim-fps", type=int, default=SIM_FPS,
+                        help=f"physics steps per second (only {FPS} is supported)")
+    parser.add_argument("--render-fps", type=int, default=RENDER_FPS,
+                        help="frame rate cap for drawing (0 = uncapped)")
+    parser.add_argument("--seed", type=int, help="seed for reproducible matches")
+    parser.add_argument("--asset-report", action="store_true",
+                        help="print the memory used by each loaded image on exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each startup phase took until the first frame")
+    parser.add_argument("--full-init", action="store_true",
+                        help="initialize every pygame subsystem instead of only the needed ones")
+    parser.add_argument("--inline-planner", action="store_true",
+                        help="run the Expert AI's search inside the game loop instead of a worker process")
+    parser.add_argument("--telemetry", choices=list(telemetry.LEVELS), default=TELEMETRY_LEVEL,
+                        help=f"record game events to {TELEMETRY_FILE}")
+    args = parser.parse_args()
+    # The physics and the AI's reaction times are tuned per tick at FPS, so
+    # any other rate would just run the whole game faster or slower
+    if args.sim_fps != FPS:
+        parser.error(f"--sim-fps {args.sim_fps} isn't supported: the physics is tuned per tick at {FPS} Hz")
+    telemetry.configure(args.telemetry, TELEMETRY_FILE)
+    
+    profile = StartupProfile() if args.profile_startup else None
+    game = Game(sim_fps=args.sim_fps, render_fps=args.render_fps, seed=args.seed,
+                fast_start=FAST_START and not args.full_init, profile=profile,
+                background_planner=BACKGROUND_PLANNER and not args.inline_planner)
+    try:
+        game.run()
+    finally:
+        if args.asset_report:
+            print(assets.format_memory_report())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,109 @@
+"""
+Particle effects for the Head Football game.
+
+ParticleSystem keeps every particle in one preallocated NumPy array (one row
+per field), integrates them all with a few vectorized operations, drops
+expired particles with a single mask, and draws them with one batched blit.
+It is used for goal confetti and can be reused for dust or trail effects.
+"""
+import numpy as np
+import pygame
+
+# Rows of the particle array
+X, Y, PREV_X, PREV_Y, VEL_X, VEL_Y, LIFETIME, SPRITE = range(8)
+FIELDS = 8
+
+
+class ParticleSystem:
+    def __init__(self, capacity=4096, gravity=0.2, colors=64, sizes=range(3, 9),
+                 color_range=(50, 255), seed=None):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.data = np.zeros((FIELDS, capacity))
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        # Particles are drawn from a fixed palette of prerendered squares, so a
+        # frame is one blits() call instead of one draw.rect per particle
+        self.sizes = list(sizes)
+        palette = np.random.default_rng(0).integers(color_range[0], color_range[1] + 1, (colors, 3))
+        self.sprites = []
+        for color in palette:
+            for size in self.sizes:
+                sprite = pygame.Surface((size, size))
+                sprite.fill(tuple(int(c) for c in color))
+                self.sprites.append(sprite)
+        self.colors = colors
+
+    def reseed(self, seed):
+        """Restart the random stream used for new particles"""
+        self.rng = np.random.default_rng(seed)
+
+    def convert(self):
+        """Convert the particle sprites to the display format (needs a display)"""
+        self.sprites = [sprite.convert() for sprite in self.sprites]
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, n, x, y, spread_x, spread_y, vel_x, vel_y, lifetime):
+        """Spawn n particles around (x, y).
+
+        spread_x/spread_y are the maximum integer offsets from (x, y), and
+        vel_x, vel_y and lifetime are (low, high) ranges. Particles beyond
+        the pool capacity are dropped.
+        """
+        n = min(n, self.capacity - self.count)
+        if n <= 0:
+            return
+        rng = self.rng
+        rows = self.data[:, self.count:self.count + n]
+        rows[X] = x + rng.integers(-spread_x, spread_x + 1, n)
+        rows[Y] = y + rng.integers(-spread_y, spread_y + 1, n)
+        rows[PREV_X] = rows[X]
+        rows[PREV_Y] = rows[Y]
+        rows[VEL_X] = rng.uniform(vel_x[0], vel_x[1], n)
+        rows[VEL_Y] = rng.uniform(vel_y[0], vel_y[1], n)
+        rows[LIFETIME] = rng.integers(lifetime[0], lifetime[1] + 1, n)
+        rows[SPRITE] = (rng.integers(0, self.colors, n) * len(self.sizes) +
+                        rng.integers(0, len(self.sizes), n))
+        self.count += n
+
+    def update(self):
+        """Advance every live particle by one tick and drop expired ones"""
+        live = self.data[:, :self.count]
+        live[PREV_X] = live[X]
+        live[PREV_Y] = live[Y]
+        live[VEL_Y] += self.gravity
+        live[X] += live[VEL_X]
+        live[Y] += live[VEL_Y]
+        live[LIFETIME] -= 1
+
+        # Compact the survivors to the front of the array in one step
+        keep = live[LIFETIME] > 0
+        survivors = int(keep.sum())
+        if survivors < self.count:
+            self.data[:, :survivors] = live[:, keep]
+            self.count = survivors
+
+    def draw(self, screen, alpha=1.0):
+        """Draw all particles, interpolated between the last two updates"""
+        if not self.count:
+            return
+        live = self.data[:, :self.count]
+        xs = (live[PREV_X] + (live[X] - live[PREV_X]) * alpha).astype(np.int32).tolist()
+        ys = (live[PREV_Y] + (live[Y] - live[PREV_Y]) * alpha).astype(np.int32).tolist()
+        sprites = self.sprites
+        screen.blits([(sprites[i], (x, y)) for i, x, y in
+                      zip(live[SPRITE].astype(np.int32).tolist(), xs, ys)], doreturn=False)
+
+    def bounding_rect(self, alpha=1.0):
+        """Screen area covered by draw(), or None when there are no particles"""
+        if not self.count:
+            return None
+        live = self.data[:, :self.count]
+        xs = live[PREV_X] + (live[X] - live[PREV_X]) * alpha
+        ys = live[PREV_Y] + (live[Y] - live[PREV_Y]) * alpha
+        left, top = int(xs.min()) - 1, int(ys.min()) - 1
+        size = max(self.sizes) + 2
+        return pygame.Rect(left, top, int(xs.max()) - left + size, int(ys.max()) - top + size)
@@ -0,0 +1,211 @@
+"""
+Background process for a planning AI.
+
+With BACKGROUND_PLANNER on, a difficulty with a planner (see search.py) has
+its MonteCarloPlanner run in a worker process by BackgroundPlanner, so the
+search never lengthens a frame. The game and the worker share two fixed
+slots of memory, each guarded by a sequence number (a seqlock): before every
+tick the game writes the match state into one as replay.encode_state bytes,
+an immutable snapshot taken between two ticks (Match.step runs the planner
+before applying any of the tick), and the worker writes its latest move and
+search counters into the other. Neither side ever waits for the other: a
+reader that keeps catching a write half done gives up until its next call
+(the game keeps playing the move it already has).
+
+A move planned from the state after tick t is played in tick t + 1 plus the
+difficulty's reaction_time (search.reaction_ticks), however fast the machine
+is and just as the inline planner delays its moves, so the AI reacts as
+quickly as its difficulty says and no quicker. When the worker falls behind,
+the newest move that is old enough keeps being played, and the staleness
+counters (ticks between the state a move was planned from and the state it
+is played from) show it. Until the worker's first move arrives the AI runs
+at the ball, as MonteCarloPlanner does before it has searched anything
+(never the reactive AI, whose random draws would keep replays from
+reproducing the match).
+"""
+import multiprocessing
+import struct
+import time
+from collections import deque
+from simulation import Match, InputState
+from replay import encode_state, decode_state, pack_inputs, unpack_inputs
+from search import (LEFT, RIGHT, STOP, MonteCarloPlanner, chase_action, reaction_ticks,
+                    search_stats, format_search_stats)
+
+# Bytes reserved for one encoded match state (encode_state needs about 200)
+STATE_CAPACITY = 512
+
+# Published by the worker: state frame, move bits, MonteCarloPlanner.counters()
+DECISION = struct.Struct("<iB7q")
+
+# Reads that catch a write part way through are retried this often, then
+# given up until the next call, so a reader never waits on the writer
+READ_ATTEMPTS = 3
+
+# How long the worker sleeps when no new state has arrived
+IDLE_SLEEP = 0.0002
+
+# Staleness histogram buckets, in ticks (the last one holds anything older)
+STALENESS_BUCKETS = 16
+
+
+class SharedSlot:
+    """Shared memory with one writer and any number of readers.
+
+    The sequence number is odd while a write is in progress, and a reader
+    keeps a payload only if the number was even and unchanged around the copy.
+    """
+    def __init__(self, capacity, context=multiprocessing):
+        self.header = context.RawArray("q", 2)  # sequence, payload length
+        self.data = context.RawArray("B", capacity)
+
+    def write(self, payload):
+        header = self.header
+        sequence = header[0]
+        header[0] = sequence + 1
+        memoryview(self.data).cast("B")[:len(payload)] = payload
+        header[1] = len(payload)
+        header[0] = sequence + 2
+
+    def read(self, last_sequence, attempts=READ_ATTEMPTS):
+        """(sequence, payload) of the latest complete write after last_sequence.
+
+        Returns None if there is nothing newer, or if every attempt caught a
+        write part way through; the caller tries again on its next call.
+        """
+        header = self.header
+        for _ in range(attempts):
+            sequence = header[0]
+            if sequence == last_sequence:
+                return None
+            if not sequence & 1:
+                payload = bytes(memoryview(self.data).cast("B")[:header[1]])
+                if header[0] == sequence:
+                    return sequence, payload
+        return None
+
+
+def run_worker(settings, states, decisions, stopping):
+    """Worker process: plan a move from every state the game publishes"""
+    # The worker's own match, restored from each published state, and a
+    # planner that doesn't delay its moves (BackgroundPlanner does that)
+    match = Match(**settings)
+    match.planner = None
+    planner = MonteCarloPlanner(settings["difficulty"], seed=settings["seed"])
+    parent = multiprocessing.parent_process()
+
+    sequence = 0
+    last_frame = None
+    while not stopping.is_set():
+        update = states.read(sequence)
+        if update is None:
+            if parent is not None and not parent.is_alive():
+                break
+            time.sleep(IDLE_SLEEP)
+            continue
+        sequence, state = update
+        decode_state(match, state)
+        if last_frame is not None and match.frame > last_frame + 1:
+            planner.skip(match.frame - last_frame - 1)
+        last_frame = match.frame
+        command = planner.think(match)
+        decisions.write(DECISION.pack(match.frame, pack_inputs(command), *planner.counters()))
+
+
+class BackgroundPlanner:
+    """Runs a difficulty's MonteCarloPlanner in a worker process; used like the planner"""
+    def __init__(self, settings):
+        self.latency = reaction_ticks(settings["difficulty"], settings["tick_rate"])
+
+        # Spawned rather than forked, so the worker doesn't inherit the display
+        context = multiprocessing.get_context("spawn")
+        self.states = SharedSlot(STATE_CAPACITY, context)
+        self.decisions = SharedSlot(DECISION.size, context)
+        self.stopping = context.Event()
+        self.process = context.Process(target=run_worker, name="planner", daemon=True,
+                                       args=(settings, self.states, self.decisions, self.stopping))
+        self.process.start()
+
+        # Moves received but not yet due, oldest first, as (state frame, bits)
+        self.received = deque()
+        self.decision_sequence = 0
+        self.chase = {LEFT: InputState(True, False, False, False),
+                      RIGHT: InputState(False, True, False, False),
+                      STOP: InputState(False, False, False, False)}
+        self.applied = None  # (state frame, InputState) being played
+        self.counters = (0,) * 7  # the worker's MonteCarloPlanner.counters()
+
+        # Staleness of the moves played
+        self.ticks = 0
+        self.fallback_ticks = 0  # no move yet, so the AI ran at the ball
+        self.late_ticks = 0  # the move was older than the reaction time
+        self.staleness_total = 0
+        self.max_staleness = 0
+        self.staleness_histogram = [0] * STALENESS_BUCKETS
+        self.handoff_ns = 0
+
+    def begin_frame(self):
+        """Nothing to do: the worker isn't tied to frames"""
+
+    def think(self, match):
+        """Publish the state before this tick and return the move due for it"""
+        start = time.perf_counter_ns()
+        frame = match.frame
+        self.states.write(encode_state(match))
+        update = self.decisions.read(self.decision_sequence)
+        if update is not None:
+            self.decision_sequence, payload = update
+            values = DECISION.unpack(payload)
+            self.received.append(values[:2])
+            self.counters = values[2:]
+
+        # Play the newest move planned at least the reaction time ago
+        received = self.received
+        due = frame - self.latency
+        while received and received[0][0] <= due:
+            state_frame, bits = received.popleft()
+            self.applied = (state_frame, unpack_inputs(bits))
+
+        self.ticks += 1
+        if self.applied is None:
+            self.fallback_ticks += 1
+            command = self.chase[chase_action(match)]
+        else:
+            state_frame, command = self.applied
+            staleness = frame - state_frame
+            self.staleness_total += staleness
+            self.max_staleness = max(self.max_staleness, staleness)
+            self.staleness_histogram[min(staleness, STALENESS_BUCKETS - 1)] += 1
+            if staleness > self.latency:
+                self.late_ticks += 1
+        self.handoff_ns += time.perf_counter_ns() - start
+        return command
+
+    def stats(self):
+        """The worker's search counters plus the staleness of the moves played"""
+        stats = search_stats(*self.counters)
+        played = self.ticks - self.fallback_ticks
+        stats.update({
+            "reaction_ticks": self.latency,
+            "ticks": self.ticks,
+            "fallback_ticks": self.fallback_ticks,
+            "late_ticks": self.late_ticks,
+            "mean_staleness": self.staleness_total / played if played else 0.0,
+            "max_staleness": self.max_staleness,
+            "staleness_histogram": list(self.staleness_histogram),
+            "mean_handoff_us": self.handoff_ns / self.ticks / 1e3 if self.ticks else 0.0,
+        })
+        return stats
+
+    def format_stats(self):
+        stats = self.stats()
+        return (f"{format_search_stats(stats)}  staleness mean {stats['mean_staleness']:.2f} "
+                f"max {stats['max_staleness']} (reaction {self.latency})  "
+                f"late {stats['late_ticks']}/{stats['ticks']}")
+
+    def close(self):
+        """Stop the worker process (calling this again does nothing)"""
+        self.stopping.set()
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
@@ -3,14 +3,28 @@ Player class for the Head Football game.
 """
 import pygame
 import os
-from config import GRAVITY, GROUND_HEIGHT, SCREEN_WIDTH, USE_PLACEHOLDER_GRAPHICS, PLAYERS_DIR
+from config import (GRAVITY, GROUND_HEIGHT, SCREEN_WIDTH, USE_PLACEHOLDER_GRAPHICS, PLAYERS_DIR,
+                    PLAYER_SPRITE_SIZE, HEAD_SPRITE_SIZE)
+from assets import assets
+import telemetry
 
 class Player:
+    # Fixed attribute layout: no per-instance dict, faster attribute access
+    __slots__ = ("x", "y", "width", "height", "profile", "is_player", "speed", "jump_power",
+                 "heading_power", "control", "color", "sprite_name", "initial_x", "initial_y",
+                 "sprite", "head_sprite", "vel_x", "vel_y", "is_jumping", "is_heading",
+                 "heading_cooldown", "heading_frames", "is_celebrating", "celebration_frames",
+                 "celebration_jump_count", "prev_x", "prev_y")
+    
+    # The fields snapshot() captures, in order
+    STATE = ("x", "y", "vel_x", "vel_y", "is_jumping", "is_heading", "heading_cooldown",
+             "heading_frames", "is_celebrating", "celebration_frames", "celebration_jump_count",
+             "prev_x", "prev_y")
+    
     def __init__(self, x, y, profile, is_player=True):
         self.x = x
         self.y = y
-        self.width = 50
-        self.height = 100
+        self.width, self.height = PLAYER_SPRITE_SIZE
         self.profile = profile
         self.is_player = is_player
         
@@ -30,19 +44,11 @@ class Player:
         self.sprite = None
         self.head_sprite = None
         if not USE_PLACEHOLDER_GRAPHICS and self.sprite_name:
+            # Surfaces are shared between every player using the same profile
             sprite_path = os.path.join(PLAYERS_DIR, f"{self.sprite_name}.png")
             head_path = os.path.join(PLAYERS_DIR, f"{self.sprite_name}_head.png")
-            try:
-                if os.path.exists(sprite_path):
-                    self.sprite = pygame.image.load(sprite_path)
-                    self.sprite = pygame.transform.scale(self.sprite, (self.width, self.height))
-                if os.path.exists(head_path):
-                    self.head_sprite = pygame.image.load(head_path)
-                    self.head_sprite = pygame.transform.scale(self.head_sprite, (30, 30))
-            except pygame.error:
-                print(f"Could not load sprite: {sprite_path}")
-                self.sprite = None
-                self.head_sprite = None
+            self.sprite = assets.get(sprite_path, (self.width, self.height))
+            self.head_sprite = assets.get(head_path, HEAD_SPRITE_SIZE)
         
         # Physics
         self.vel_x = 0
@@ -50,14 +56,16 @@ class Player:
         self.is_jumping = False
         self.is_heading = False
         self.heading_cooldown = 0
+        self.heading_frames = 0
         
         # Celebration state
         self.is_celebrating = False
         self.celebration_frames = 0
         self.celebration_jump_count = 0
         
-        # Create a simple rectangle for collision detection
-        self.rect = pygame.Rect(x, y, self.width, self.height)
+        # Position before the latest physics step, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
         
     def move_left(self):
         self.vel_x = -self.speed
@@ -85,7 +93,8 @@ class Player:
                 self.heading_cooldown = 15  # Normal cooldown for AI
                 self.heading_frames = 5  # Keep heading state active for 5 frames
                 
-            print(f"{'Player' if self.is_player else 'AI'} attempting to head the ball")
+            if telemetry.level >= telemetry.DEBUG:
+                telemetry.record(telemetry.HEADER, "player" if self.is_player else "ai")
             
             # Add a small upward boost when heading to help reach the ball
             if self.is_player:  # More powerful boost for human player
@@ -103,6 +112,50 @@ class Player:
             return True
         return False
             
+    @property
+    def rect(self):
+        """Collision rectangle of the body (built on demand)"""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+        
+    def clone(self, rng=None):
+        """Copy of the player for lookahead (profile and sprites are shared, not copied)"""
+        player = object.__new__(type(self))
+        player.copy_settings(self, rng)
+        player.restore(self.snapshot())
+        return player
+        
+    def copy_settings(self, other, rng=None):
+        """Copy everything that isn't STATE from other"""
+        self.width, self.height, self.profile, self.is_player = (
+            other.width, other.height, other.profile, other.is_player)
+        self.speed, self.jump_power, self.heading_power, self.control = (
+            other.speed, other.jump_power, other.heading_power, other.control)
+        self.color, self.sprite_name, self.sprite, self.head_sprite = (
+            other.color, other.sprite_name, other.sprite, other.head_sprite)
+        self.initial_x, self.initial_y = other.initial_x, other.initial_y
+        
+    def snapshot(self):
+        """Return the physics state (the STATE fields) as a tuple (see restore)"""
+        return (self.x, self.y, self.vel_x, self.vel_y, self.is_jumping, self.is_heading,
+                self.heading_cooldown, self.heading_frames, self.is_celebrating,
+                self.celebration_frames, self.celebration_jump_count, self.prev_x, self.prev_y)
+        
+    def restore(self, state):
+        """Restore physics state captured by snapshot"""
+        (self.x, self.y, self.vel_x, self.vel_y, self.is_jumping, self.is_heading,
+         self.heading_cooldown, self.heading_frames, self.is_celebrating,
+         self.celebration_frames, self.celebration_jump_count, self.prev_x, self.prev_y) = state
+        
+    def save_previous(self):
+        """Remember the current position before the next physics step"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
+    def interpolated_position(self, alpha):
+        """Blend the previous and current position (alpha 0 = previous, 1 = current)"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+        
     def update(self):
         # Apply gravity
         self.vel_y += GRAVITY
@@ -126,15 +179,10 @@ class Player:
         # Update heading state
         if self.is_heading:
             # For both human player and AI, use heading_frames
-            if hasattr(self, 'heading_frames'):
-                self.heading_frames -= 1
-                if self.heading_frames <= 0:
-                    self.is_heading = False
-                    self.heading_frames = 0
-            else:
-                # Fallback in case heading_frames is not set
-                self.heading_frames = 0
+            self.heading_frames -= 1
+            if self.heading_frames <= 0:
                 self.is_heading = False
+                self.heading_frames = 0
             
         # Update cooldown
         if self.heading_cooldown > 0:
@@ -143,10 +191,6 @@ class Player:
         # Update celebration if celebrating
         if self.is_celebrating:
             self.update_celebration()
-            
-        # Update rectangle position
-        self.rect.x = self.x
-        self.rect.y = self.y
         
     def reset_position(self):
         """Reset player to initial position"""
@@ -158,13 +202,20 @@ class Player:
         self.is_heading = False
         self.is_celebrating = False
         
-    def draw(self, screen):
+        # Don't interpolate across the jump back to the starting position
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
+    def draw(self, screen, alpha=1.0):
+        # Draw at the position interpolated between the last two physics steps
+        x, y = self.interpolated_position(alpha)
+        
         if self.sprite:
             # Draw player sprite
             # Add shadow beneath player for better grounding effect
             shadow_radius = self.width // 3
             shadow_y = GROUND_HEIGHT - 5  # Just above the ground
-            shadow_x = self.x + self.width // 2
+            shadow_x = x + self.width // 2
             
             # Draw oval shadow with transparency
             shadow_surface = pygame.Surface((shadow_radius * 2, shadow_radius), pygame.SRCALPHA)
@@ -175,34 +226,34 @@ class Player:
             if self.is_heading and self.head_sprite:
                 # If we're heading and have a head sprite, we'll draw it separately
                 # For now, just draw the body sprite
-                screen.blit(self.sprite, (self.x, self.y))
+                screen.blit(self.sprite, (x, y))
                 
                 # Draw the separate head sprite above the body
-                head_x = self.x + self.width // 2 - 15  # Center the head
-                head_y = self.y - 15  # Position above body
+                head_x = x + self.width // 2 - 15  # Center the head
+                head_y = y - 15  # Position above body
                 screen.blit(self.head_sprite, (head_x, head_y))
             else:
                 # Just draw the normal sprite which includes the head
-                screen.blit(self.sprite, (self.x, self.y))
+                screen.blit(self.sprite, (x, y))
         else:
             # Draw shadow beneath player
             shadow_radius = 15
             shadow_y = GROUND_HEIGHT - 5
-            shadow_x = self.x + self.width // 2
+            shadow_x = x + self.width // 2
             pygame.draw.ellipse(screen, (0, 0, 0, 80), (shadow_x - shadow_radius, shadow_y - shadow_radius // 2, shadow_radius * 2, shadow_radius))
             
             # Draw player body (simple rectangle as fallback)
-            pygame.draw.rect(screen, self.color, self.rect)
+            pygame.draw.rect(screen, self.color, (x, y, self.width, self.height))
             
             # Draw only one head
             head_radius = 15
-            head_x = self.x + self.width // 2
+            head_x = x + self.width // 2
             
             # Adjust head position when heading
             if self.is_heading:
-                head_y = self.y - 5  # Move head up when heading
+                head_y = y - 5  # Move head up when heading
             else:
-                head_y = self.y + head_radius
+                head_y = y + head_radius
                 
             # Draw the head
             pygame.draw.circle(screen, self.color, (head_x, head_y), head_radius)
@@ -221,6 +272,16 @@ class Player:
                 pygame.draw.circle(screen, (255, 0, 0), (head_x - 5, head_y - 5), 2)
                 pygame.draw.circle(screen, (255, 0, 0), (head_x + 5, head_y - 5), 2)
             
+    def bounding_rect(self, alpha=1.0):
+        """Screen area touched by draw(), including the raised head and the shadow"""
+        x, y = self.interpolated_position(alpha)
+        body = pygame.Rect(int(x) - 1, int(y) - 21, self.width + 2, self.height + 22)
+        shadow_radius = self.width // 3 if self.sprite else 15
+        shadow_x = int(x) + self.width // 2
+        shadow = pygame.Rect(shadow_x - shadow_radius - 1, GROUND_HEIGHT - 5 - shadow_radius // 2 - 1,
+                             shadow_radius * 2 + 2, shadow_radius + 2)
+        return body.union(shadow)
+        
     def get_head_position(self):
         """Return the position of the player's head for collision detection"""
         if self.sprite:
@@ -242,7 +303,8 @@ class Player:
         self.vel_y = -self.jump_power * 0.7
         self.is_jumping = True
         
-        print(f"{'Player' if self.is_player else 'AI'} celebrating!")
+        if telemetry.level >= telemetry.DEBUG:
+            telemetry.record(telemetry.CELEBRATION, "player" if self.is_player else "ai")
         
     def update_celebration(self):
         """Update the celebration animation"""
@@ -0,0 +1,123 @@
+"""
+Frame-time profiler for the Head Football game.
+
+Game.run times each phase of a frame with perf_counter_ns into a fixed-size
+ring buffer while the profiler is enabled (F3 by default), and the overlay
+draws a rolling graph of frame times with p50/p95/p99. F4 exports the buffer
+to CSV. When the profiler is disabled the loop only checks one flag.
+"""
+import csv
+import os
+import time
+import numpy as np
+import pygame
+from fonts import get_font
+
+PHASES = ("events", "update", "render", "flip", "wait")
+TOTAL = len(PHASES)  # column holding the whole frame
+
+
+class FrameProfiler:
+    def __init__(self, capacity=600, graph_frames=240, target_fps=60):
+        self.enabled = False
+        self.capacity = capacity
+        self.samples = np.zeros((capacity, len(PHASES) + 1), dtype=np.int64)
+        self.frame_numbers = np.zeros(capacity, dtype=np.int64)
+        self.index = 0
+        self.count = 0
+        self.frame = 0
+        self.graph_frames = min(graph_frames, capacity)
+        self.budget_ns = 1_000_000_000 // target_fps if target_fps else 0
+
+        # The current frame's phase times, filled in by Game.run
+        self.current = [0] * len(PHASES)
+
+        # Overlay text is refreshed a few times a second, not every frame
+        self.text = []
+        self.text_frame = -1
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def end_frame(self):
+        """Store the current frame's phase times in the ring buffer"""
+        row = self.samples[self.index]
+        row[:TOTAL] = self.current
+        row[TOTAL] = sum(self.current)
+        self.frame_numbers[self.index] = self.frame
+        self.frame += 1
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def recent(self, frames=None):
+        """The last frames rows in chronological order"""
+        frames = self.count if frames is None else min(frames, self.count)
+        order = (np.arange(self.index - frames, self.index)) % self.capacity
+        return self.samples[order], self.frame_numbers[order]
+
+    def percentiles(self, q=(50, 95, 99)):
+        """Frame time percentiles in milliseconds over the whole buffer"""
+        if not self.count:
+            return [0.0] * len(q)
+        return (np.percentile(self.samples[:self.count, TOTAL], q) / 1e6).tolist()
+
+    def export_csv(self, path):
+        """Write every buffered frame to a CSV file (times in nanoseconds)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        samples, frames = self.recent()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{phase}_ns" for phase in PHASES] + ["total_ns"])
+            for frame, row in zip(frames.tolist(), samples.tolist()):
+                writer.writerow([frame] + row)
+        return path
+
+    def overlay_rect(self, screen, notes=0):
+        """Screen area covered by draw() with that many extra lines"""
+        width, height = screen.get_size()
+        return pygame.Rect(10, height - 170 - notes * 17, self.graph_frames + 20, 135 + notes * 17)
+
+    def draw(self, screen, notes=()):
+        """Draw the frame-time graph and statistics, plus any lines of notes"""
+        rect = self.overlay_rect(screen, len(notes))
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # Bars for the most recent frames; 0 .. 2x budget fills the graph
+        graph = pygame.Rect(10, 60 + len(notes) * 17, self.graph_frames, 65)
+        scale_ns = 2 * self.budget_ns or 33_333_333
+        samples, _ = self.recent(self.graph_frames)
+        heights = np.minimum(samples[:, TOTAL] * graph.height // scale_ns, graph.height).tolist()
+        x = graph.right - len(heights)
+        for total_ns, bar in zip(samples[:, TOTAL].tolist(), heights):
+            color = (80, 220, 80) if not self.budget_ns or total_ns <= self.budget_ns else (240, 80, 60)
+            panel.fill(color, (x, graph.bottom - bar, 1, bar))
+            x += 1
+        if self.budget_ns:
+            budget_y = graph.bottom - graph.height // 2
+            pygame.draw.line(panel, (255, 255, 255), (graph.left, budget_y), (graph.right, budget_y))
+
+        if self.frame - self.text_frame >= 15 or len(self.text) != 3 + len(notes):
+            self.text_frame = self.frame
+            font = get_font('Arial', 14)
+            p50, p95, p99 = self.percentiles()
+            means = samples[:, :TOTAL].mean(axis=0) / 1e6 if len(samples) else [0.0] * TOTAL
+            phases = "  ".join(f"{phase} {mean:.2f}" for phase, mean in zip(PHASES, means))
+            self.text = [font.render(f"frame ms  p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}",
+                                     True, (255, 255, 255)),
+                         font.render(phases, True, (200, 200, 200)),
+                         font.render("F3 hide  F4 export CSV", True, (150, 150, 150))]
+            self.text[2:2] = [font.render(note, True, (200, 200, 120)) for note in notes]
+        for i, text in enumerate(self.text):
+            panel.blit(text, (10, 4 + i * 17))
+
+        screen.blit(panel, rect)
+        return rect
+
+
+def timestamp_path(directory):
+    """A fresh CSV file name in directory"""
+    return os.path.join(directory, time.strftime("frames_%Y%m%d_%H%M%S.csv"))
@@ -0,0 +1,289 @@
+"""
+Compact match replays for Head Football.
+
+A match is fully determined by its seed, the two profiles, the difficulty
+and the human player's inputs, so a replay stores just those: one byte per
+tick (left player's controls in the low nibble, the AI's decisions in the
+high nibble, used to detect desyncs and to replay a planning AI's moves),
+compressed, plus a small full-state
+keyframe every KEYFRAME_INTERVAL ticks so any tick can be reached without
+re-simulating from kickoff.
+
+File layout (little endian):
+    b"HFRP", u8 version
+    u16 length + JSON header (seed, profiles, difficulty, tick rate, ...)
+    u32 tick count, u32 length + zlib-compressed tick bytes
+    u16 keyframe count, then per keyframe: u32 tick, u16 length, state bytes
+
+Run from the head_football directory:
+    python replay.py replays/match_20240101_120000.hfr [--seek TICK]
+"""
+import argparse
+import bisect
+import json
+import os
+import struct
+import time
+import zlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from simulation import Match, InputState
+
+MAGIC = b"HFRP"
+VERSION = 1
+KEYFRAME_INTERVAL = 600  # ticks (10 seconds at 60 FPS)
+
+# Bits of the per-tick byte: left player in the low nibble, AI in the high nibble
+LEFT, RIGHT, JUMP, HEAD = 1, 2, 4, 8
+
+# Keyframe record layouts
+MATCH_FORMAT = struct.Struct("<IiiiBiiBQ")
+BALL_FORMAT = struct.Struct("<4diB2d")
+PLAYER_FORMAT = struct.Struct("<4d2B2iB2i2d")
+AI_FORMAT = struct.Struct("<diB2d")
+
+
+class ReplayError(Exception):
+    """Raised for unreadable replay files and playback desyncs"""
+
+
+def pack_inputs(inputs):
+    """Pack an InputState into four bits"""
+    return ((LEFT if inputs.left else 0) | (RIGHT if inputs.right else 0) |
+            (JUMP if inputs.jump else 0) | (HEAD if inputs.head else 0))
+
+
+def unpack_inputs(bits):
+    """Unpack four bits into an InputState"""
+    return InputState(bool(bits & LEFT), bool(bits & RIGHT), bool(bits & JUMP), bool(bits & HEAD))
+
+
+def ai_decision_bits(ai):
+    """What an AIOpponent did in its latest update, packed like human inputs"""
+    return ((LEFT if ai.vel_x < 0 else 0) | (RIGHT if ai.vel_x > 0 else 0) |
+            (JUMP if ai.decided_jump else 0) | (HEAD if ai.decided_head else 0))
+
+
+def encode_state(match):
+    """Serialize Match.snapshot() into keyframe bytes"""
+    (frame, player_score, ai_score, goal_cooldown, reset_pending, reset_timer,
+     game_time, finished, rng_state, ball, player, ai_opponent) = match.snapshot()
+
+    # The ball refers to the last player it touched; store that as an index
+    last = ball[5]
+    last_index = 0 if last is None else 1 if last is match.player else 2
+    ball = ball[:5] + (last_index,) + ball[6:]
+
+    parts = [MATCH_FORMAT.pack(frame, player_score, ai_score, goal_cooldown, reset_pending,
+                               reset_timer, game_time, finished, rng_state),
+             BALL_FORMAT.pack(*ball)]
+    for state in (player, ai_opponent):
+        parts.append(PLAYER_FORMAT.pack(*state[:13]))
+        if len(state) > 13:
+            target_x, decision_timer, last_ball_pos = state[13:]
+            has_pos = last_ball_pos is not None
+            parts.append(AI_FORMAT.pack(target_x, decision_timer, has_pos,
+                                        *(last_ball_pos if has_pos else (0.0, 0.0))))
+    return b"".join(parts)
+
+
+def decode_state(match, data):
+    """Restore a match from keyframe bytes written by encode_state"""
+    offset = 0
+
+    def read(fmt):
+        nonlocal offset
+        values = fmt.unpack_from(data, offset)
+        offset += fmt.size
+        return values
+
+    (frame, player_score, ai_score, goal_cooldown, reset_pending, reset_timer,
+     game_time, finished, rng_state) = read(MATCH_FORMAT)
+    ball = read(BALL_FORMAT)
+    entities = {0: None, 1: match.player, 2: match.ai_opponent}
+    ball = ball[:5] + (entities[ball[5]],) + ball[6:]
+
+    players = []
+    for is_ai in (match.player_is_ai, True):
+        state = read(PLAYER_FORMAT)
+        state = state[:4] + (bool(state[4]), bool(state[5])) + state[6:8] + (bool(state[8]),) + state[9:]
+        if is_ai:
+            target_x, decision_timer, has_pos, ball_x, ball_y = read(AI_FORMAT)
+            state += (target_x, decision_timer, (ball_x, ball_y) if has_pos else None)
+        players.append(state)
+
+    match.restore((frame, player_score, ai_score, goal_cooldown, bool(reset_pending), reset_timer,
+                   game_time, bool(finished), rng_state, ball, players[0], players[1]))
+
+
+class ReplayRecorder:
+    """Records a match tick by tick; call record() right after every match.step()"""
+    def __init__(self, match, player_profile, ai_profile, difficulty, player_difficulty=None,
+                 keyframe_interval=KEYFRAME_INTERVAL):
+        self.match = match
+        self.header = {
+            "version": VERSION,
+            "seed": match.seed,
+            "player_profile": player_profile,
+            "ai_profile": ai_profile,
+            "difficulty": difficulty,
+            "player_difficulty": player_difficulty,
+            "tick_rate": match.tick_rate,
+            "keyframe_interval": keyframe_interval,
+        }
+        self.keyframe_interval = keyframe_interval
+        self.ticks = bytearray()
+        self.keyframes = []
+
+    def record(self, inputs):
+        """Log the inputs and AI decisions of the tick that was just stepped"""
+        if self.match.player_is_ai:
+            left = ai_decision_bits(self.match.player)
+        else:
+            left = pack_inputs(inputs)
+        self.ticks.append(left | ai_decision_bits(self.match.ai_opponent) << 4)
+
+        if self.match.frame % self.keyframe_interval == 0:
+            self.keyframes.append((self.match.frame, encode_state(self.match)))
+
+    def to_bytes(self):
+        header = json.dumps(self.header, separators=(",", ":")).encode("utf-8")
+        ticks = zlib.compress(bytes(self.ticks), 9)
+        parts = [MAGIC, struct.pack("<B", VERSION),
+                 struct.pack("<H", len(header)), header,
+                 struct.pack("<II", len(self.ticks), len(ticks)), ticks,
+                 struct.pack("<H", len(self.keyframes))]
+        for tick, state in self.keyframes:
+            parts.append(struct.pack("<IH", tick, len(state)))
+            parts.append(state)
+        return b"".join(parts)
+
+    def save(self, path):
+        """Write the replay to path, creating its directory if needed"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+class Replay:
+    """A loaded replay that can be played back or seeked to any tick"""
+    def __init__(self, header, ticks, keyframes):
+        self.header = header
+        self.ticks = ticks
+        self.keyframes = keyframes
+        self.keyframe_ticks = [tick for tick, _ in keyframes]
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != MAGIC:
+            raise ReplayError("not a Head Football replay")
+        if data[4] != VERSION:
+            raise ReplayError(f"unsupported replay version {data[4]}")
+        offset = 5
+        (header_length,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        header = json.loads(data[offset:offset + header_length].decode("utf-8"))
+        offset += header_length
+        tick_count, ticks_length = struct.unpack_from("<II", data, offset)
+        offset += 8
+        ticks = zlib.decompress(data[offset:offset + ticks_length])
+        offset += ticks_length
+        if len(ticks) != tick_count:
+            raise ReplayError("truncated tick data")
+        (keyframe_count,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        keyframes = []
+        for _ in range(keyframe_count):
+            tick, length = struct.unpack_from("<IH", data, offset)
+            offset += 6
+            keyframes.append((tick, data[offset:offset + length]))
+            offset += length
+        return cls(header, ticks, keyframes)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def new_match(self):
+        """Create the match as it was at kickoff"""
+        header = self.header
+        match = Match(header["player_profile"], header["ai_profile"], header["difficulty"],
+                      player_difficulty=header["player_difficulty"],
+                      tick_rate=header["tick_rate"], seed=header["seed"])
+        # A planner's search depends on how much CPU time it got, so it won't
+        # choose the same moves twice; play() feeds it the recorded ones
+        match.planner = None
+        return match
+
+    def inputs(self, start=0, stop=None):
+        """Human inputs for ticks start..stop"""
+        return [unpack_inputs(bits & 0x0F) for bits in self.ticks[start:stop]]
+
+    def play(self, match, stop=None, verify=True):
+        """Step match from its current tick up to stop (default: the end)"""
+        stop = len(self.ticks) if stop is None else self.check_tick(stop)
+        planned = bool(self.header["difficulty"].get("planner"))
+        while match.frame < stop:
+            # A finished match no longer advances, so never wait for it to
+            if match.finished:
+                if verify:
+                    raise ReplayError(f"replay desynced: the match ended at tick {match.frame}, "
+                                      f"but {len(self.ticks)} ticks were recorded")
+                break
+            bits = self.ticks[match.frame]
+            if planned:
+                match.ai_opponent.command = unpack_inputs(bits >> 4)
+            match.step(unpack_inputs(bits & 0x0F))
+            if verify and ai_decision_bits(match.ai_opponent) != bits >> 4:
+                raise ReplayError(f"replay desynced at tick {match.frame}")
+        return match
+
+    def check_tick(self, tick):
+        """tick, if the replay has it; raises ReplayError otherwise"""
+        if not 0 <= tick <= len(self.ticks):
+            raise ReplayError(f"tick {tick} is outside the replay (0 to {len(self.ticks)})")
+        return tick
+
+    def seek(self, tick, verify=True):
+        """Return a match at the given tick, starting from the nearest keyframe"""
+        self.check_tick(tick)
+        match = self.new_match()
+        index = bisect.bisect_right(self.keyframe_ticks, tick) - 1
+        if index >= 0:
+            decode_state(match, self.keyframes[index][1])
+        return self.play(match, stop=tick, verify=verify)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and play back a Head Football replay")
+    parser.add_argument("path", help="replay file (.hfr)")
+    parser.add_argument("--seek", type=int, help="show the match state at this tick")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    header = replay.header
+    print(f"{args.path}: {os.path.getsize(args.path)} bytes, {len(replay.ticks)} ticks, "
+          f"{len(replay.keyframes)} keyframes, seed {header['seed']}")
+
+    start = time.perf_counter()
+    try:
+        if args.seek is not None:
+            match = replay.seek(args.seek)
+        else:
+            match = replay.play(replay.new_match())
+    except ReplayError as e:
+        parser.exit(1, f"{args.path}: {e}\n")
+    elapsed = time.perf_counter() - start
+
+    print(f"Tick {match.frame}: score {match.player_score} - {match.ai_score}, "
+          f"ball at ({match.ball.x:.1f}, {match.ball.y:.1f})")
+    simulated = match.frame / header["tick_rate"]
+    print(f"Replayed in {elapsed:.3f}s ({simulated / max(elapsed, 1e-9):,.0f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
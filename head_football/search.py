@@ -0,0 +1,283 @@
+"""
+Monte Carlo tree search planner for the Head Football AI.
+
+A difficulty with "planner": "mcts" in DIFFICULTY_SETTINGS has its opponent
+steered by MonteCarloPlanner instead of the reactive AIOpponent logic. The
+planner forks the live match (Match.fork) and rolls the copies forward to
+score sequences of moves (left, right, stop, jump, head), each held for
+action_ticks ticks. The human player is modelled by ChaseInput.
+
+The search is open-loop and anytime: every tick it runs as many iterations as
+fit in its CPU budget, keeps the tree between ticks, and when an action ends
+it re-roots the tree at the child that was played, so earlier work carries
+over. Game.run calls begin_frame() so all the steps of one frame share a
+single budget; headless matches get the budget on every tick. In the game
+the planner normally runs in a worker process instead (planner_worker.py).
+
+For a planner, reaction_time is how long a move lags behind the state it was
+planned from: the move chosen after tick t is played reaction_time later,
+inline or in the worker, so the AI never reacts faster than its difficulty.
+"""
+import math
+import random
+import time
+from collections import deque
+from config import SCREEN_WIDTH
+import telemetry
+
+# Searching stops this long before the deadline, leaving time for the last
+# simulated tick and the decision itself
+DEADLINE_MARGIN_NS = 200_000
+
+# Moves the planner chooses between, as (left, right, jump, head) commands
+LEFT, RIGHT, STOP, JUMP, HEAD = range(5)
+ACTION_NAMES = ("left", "right", "stop", "jump", "head")
+
+
+class OutOfTime(Exception):
+    """Raised inside an iteration that reached the deadline (it is discarded)"""
+
+
+class Node:
+    """Visit statistics for one sequence of actions from the root"""
+    __slots__ = ("visits", "value", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.children = [None] * len(ACTION_NAMES)
+
+
+class MonteCarloPlanner:
+    def __init__(self, difficulty, seed=None, latency=0):
+        from simulation import InputState, ChaseInput
+        self.actions = (InputState(True, False, False, False), InputState(False, True, False, False),
+                        InputState(False, False, False, False), InputState(False, False, True, False),
+                        InputState(False, False, False, True))
+        self.model = ChaseInput()
+        self.rng = random.Random(seed)
+
+        self.budget_ns = int(difficulty.get("search_budget_ms", 4.0) * 1_000_000)
+        self.action_ticks = difficulty.get("action_ticks", 6)
+        self.rollout_actions = difficulty.get("rollout_actions", 3)
+        self.max_depth = difficulty.get("search_depth", 4)
+        self.exploration = difficulty.get("exploration", 0.7)
+
+        # Each move is played this many ticks after the state it was planned
+        # from (see reaction_ticks); 0 when a BackgroundPlanner delays them
+        self.latency = latency
+        self.delayed = deque()
+
+        # Search tree and the action being played
+        self.root = Node()
+        self.action = STOP
+        self.pending = 0  # ticks of the current action still to play
+        self.scratch = None  # match fork reused by every iteration
+        self.frame_deadline_ns = None
+        self.iteration_ns = 0  # running estimate of one iteration's cost
+
+        # Counters
+        self.think_calls = 0
+        self.overruns = 0
+        self.iterations = 0
+        self.nodes = 0
+        self.search_ns = 0
+        self.max_think_ns = 0
+        self.max_think_cpu_ns = 0  # the same on this thread's CPU clock
+
+    def begin_frame(self):
+        """Start a new frame: the steps until the next call share one budget"""
+        self.frame_deadline_ns = time.perf_counter_ns() + self.budget_ns
+
+    def think(self, match):
+        """Search within the budget and return the AI's command for the next tick.
+
+        Match.step calls this before applying any of the tick, so match (and
+        every fork of it) is in a state between two ticks.
+        """
+        start = time.perf_counter_ns()
+        cpu_start = time.thread_time_ns()
+        deadline = self.frame_deadline_ns if self.frame_deadline_ns is not None else start + self.budget_ns
+
+        # Rollouts must not report their collisions and jumps
+        with telemetry.suspended():
+            self.search(match, deadline - DEADLINE_MARGIN_NS)
+        if self.pending <= 0:
+            self.decide(match)
+        self.pending -= 1
+
+        end = time.perf_counter_ns()
+        elapsed = end - start
+        self.think_calls += 1
+        self.search_ns += elapsed
+        self.max_think_ns = max(self.max_think_ns, elapsed)
+        # The OS can pause the process for longer than the whole budget; the
+        # CPU clock leaves that out, so it shows the search's own overruns
+        self.max_think_cpu_ns = max(self.max_think_cpu_ns, time.thread_time_ns() - cpu_start)
+        if start < deadline < end:
+            self.overruns += 1
+
+        command = self.actions[self.action]
+        if self.latency:
+            # Until the first planned move is due, run at the ball
+            self.delayed.append(command)
+            command = (self.delayed.popleft() if len(self.delayed) > self.latency
+                       else self.actions[chase_action(match)])
+        return command
+
+    def decide(self, match):
+        """Commit to the most visited action and re-root the tree there"""
+        children = self.root.children
+        visited = [i for i, child in enumerate(children) if child is not None and child.visits]
+        if visited:
+            self.action = max(visited, key=lambda i: children[i].visits)
+        else:
+            self.action = chase_action(match)
+        self.root = children[self.action] or Node()
+        self.pending = self.action_ticks
+
+    def search(self, match, deadline):
+        """Run iterations until the next one would pass the deadline"""
+        while time.perf_counter_ns() + self.iteration_ns < deadline:
+            start = time.perf_counter_ns()
+            try:
+                self.iterate(match, deadline)
+            except OutOfTime:
+                break
+            cost = time.perf_counter_ns() - start
+            self.iteration_ns = cost if not self.iteration_ns else (self.iteration_ns * 7 + cost) // 8
+
+    def iterate(self, match, deadline):
+        """One select / expand / roll out / back up pass"""
+        # Like every simulated tick (see play), the fork is only started in time
+        if time.perf_counter_ns() > deadline:
+            raise OutOfTime()
+        if self.scratch is None:
+            self.scratch = match.fork()
+        sim = match.fork(into=self.scratch)
+        base = sim.ai_score - sim.player_score
+
+        # Finish the action already being played, then walk down the tree
+        over = self.pending > 0 and self.play(sim, self.action, self.pending, deadline)
+        node = self.root
+        path = [node]
+        depth = 0
+        while not over and depth < self.max_depth:
+            untried = [i for i, child in enumerate(node.children) if child is None]
+            if untried:
+                action = self.rng.choice(untried)
+                node.children[action] = child = Node()
+                self.nodes += 1
+            else:
+                action = self.select(node)
+                child = node.children[action]
+            over = self.play(sim, action, self.action_ticks, deadline)
+            path.append(child)
+            node = child
+            depth += 1
+            if untried:
+                break
+
+        # Random playout beyond the tree
+        for _ in range(self.rollout_actions):
+            if over:
+                break
+            over = self.play(sim, self.rng.randrange(len(ACTION_NAMES)), self.action_ticks, deadline)
+
+        value = self.evaluate(sim, base)
+        for node in path:
+            node.visits += 1
+            node.value += value
+        self.iterations += 1
+
+    def select(self, node):
+        """UCB1 over fully expanded children"""
+        # Iterations cut off by the deadline add children without visiting
+        # them, so a node can be fully expanded and still unvisited
+        log_visits = math.log(max(node.visits, 1))
+        best, best_score = STOP, -1.0
+        for action, child in enumerate(node.children):
+            score = (child.value / child.visits +
+                     self.exploration * (log_visits / child.visits) ** 0.5) if child.visits else 2.0
+            if score > best_score:
+                best, best_score = action, score
+        return best
+
+    def play(self, sim, action, ticks, deadline):
+        """Step a fork with the AI holding action; True once a goal or the end stops play"""
+        sim.ai_opponent.command = self.actions[action]
+        model = self.model
+        clock = time.perf_counter_ns
+        for _ in range(ticks):
+            if clock() > deadline:
+                raise OutOfTime()
+            if sim.step(model.read(sim)) or sim.finished:
+                return True
+        return False
+
+    def evaluate(self, sim, base):
+        """Value of a rolled-out state for the AI, in [0, 1]"""
+        goals = sim.ai_score - sim.player_score - base
+        if goals:
+            return 1.0 if goals > 0 else 0.0
+        # The AI attacks the left goal: reward pushing the ball that way and
+        # staying close enough to play it
+        ai = sim.ai_opponent
+        ball_x = sim.ball.x
+        attack = 1.0 - ball_x / SCREEN_WIDTH
+        reach = 1.0 - min(abs(ball_x - (ai.x + ai.width / 2)) / SCREEN_WIDTH, 1.0)
+        return 0.25 + 0.35 * attack + 0.15 * reach
+
+    def skip(self, ticks):
+        """Account for ticks the match moved on without think() (a worker that fell behind)"""
+        self.pending -= ticks
+
+    def counters(self):
+        """Raw search counters, as taken by search_stats()"""
+        return (self.think_calls, self.overruns, self.iterations, self.nodes, self.search_ns,
+                self.max_think_ns, self.max_think_cpu_ns)
+
+    def stats(self):
+        """Search counters so far"""
+        return search_stats(*self.counters())
+
+    def format_stats(self):
+        return format_search_stats(self.stats())
+
+    def close(self):
+        """Nothing to release (see planner_worker.BackgroundPlanner)"""
+
+
+def reaction_ticks(difficulty, tick_rate):
+    """A planning difficulty's reaction_time in ticks: how long its moves lag the state"""
+    return round(difficulty["reaction_time"] * tick_rate)
+
+
+def chase_action(match):
+    """LEFT, RIGHT or STOP to run the AI at the ball, for when nothing has been searched"""
+    ai = match.ai_opponent
+    centre = ai.x + ai.width / 2
+    return LEFT if match.ball.x < centre - 10 else RIGHT if match.ball.x > centre + 10 else STOP
+
+
+def search_stats(think_calls, overruns, iterations, nodes, search_ns, max_think_ns, max_think_cpu_ns):
+    """Rates and means from a planner's raw counters"""
+    seconds = search_ns / 1e9
+    return {
+        "think_calls": think_calls,
+        "overruns": overruns,
+        "iterations": iterations,
+        "nodes": nodes,
+        "nodes_per_second": nodes / seconds if seconds else 0.0,
+        "iterations_per_second": iterations / seconds if seconds else 0.0,
+        "mean_think_ms": search_ns / think_calls / 1e6 if think_calls else 0.0,
+        "max_think_ms": max_think_ns / 1e6,
+        "max_think_cpu_ms": max_think_cpu_ns / 1e6,
+    }
+
+
+def format_search_stats(stats):
+    return (f"search {stats['nodes_per_second']:,.0f} nodes/s  "
+            f"{stats['iterations_per_second']:,.0f} rollouts/s  "
+            f"overruns {stats['overruns']}/{stats['think_calls']}  "
+            f"max {stats['max_think_ms']:.1f} ms ({stats['max_think_cpu_ms']:.1f} ms CPU)")
@@ -0,0 +1,371 @@
+"""
+Headless simulation core for the Head Football game.
+
+A Match owns the ball, both players, the goals, the score and the match
+clock, and advances them one tick at a time from an explicit input source.
+Nothing in here opens a window, so matches can be stepped far faster than
+real time. Game in main.py drives the same Match object, which keeps the
+windowed game and the headless simulation on exactly the same physics.
+"""
+import random
+from collections import namedtuple
+from config import (
+    SCREEN_WIDTH, GROUND_HEIGHT, GOAL_WIDTH, GOAL_HEIGHT, GAME_TIME, MAX_SCORE, FPS
+)
+from player import Player
+from ai import AIOpponent
+from ball import Ball
+import telemetry
+
+# Top of the goal mouth used for scoring (see Game.fix_goal_positions)
+FIELD_HEIGHT = 200
+GOAL_AREA_HEIGHT = 80
+GOAL_AREA_Y = (GROUND_HEIGHT - 100) + (FIELD_HEIGHT - GOAL_AREA_HEIGHT) // 2 - 30
+
+# Frames to wait before resetting positions, and goal detection cooldown
+RESET_DELAY = 60
+GOAL_COOLDOWN = 120
+
+# Per-tick controls for the human player (LEFT, RIGHT, SPACE, UP)
+InputState = namedtuple("InputState", ["left", "right", "jump", "head"])
+NO_INPUT = InputState(False, False, False, False)
+
+
+class MatchRandom(random.Random):
+    """random.Random with a 64-bit SplitMix64 state.
+
+    Behaves like random.Random (uniform, randint, choice, ...) but its whole
+    state is one integer, so keyframes and cloned matches can store it cheaply.
+    """
+    def seed(self, a=None):
+        if a is None:
+            a = random.getrandbits(64)
+        self.state = a & 0xFFFFFFFFFFFFFFFF
+        self.gauss_next = None
+
+    def next_uint64(self):
+        self.state = (self.state + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        z = self.state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        return z ^ (z >> 31)
+
+    def random(self):
+        return (self.next_uint64() >> 11) * (1.0 / 9007199254740992.0)
+
+    def getrandbits(self, k):
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self.next_uint64() << shift
+        return bits & ((1 << k) - 1)
+
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
+        self.gauss_next = None
+        
+    @classmethod
+    def from_state(cls, state):
+        """A new stream continuing from getstate() (cheaper than seeding)"""
+        rng = cls.__new__(cls)
+        rng.setstate(state)
+        return rng
+
+
+class KeyboardInput:
+    """Read the human player's controls from the pygame keyboard state"""
+    def read(self, match):
+        import pygame
+        keys = pygame.key.get_pressed()
+        return InputState(keys[pygame.K_LEFT], keys[pygame.K_RIGHT],
+                          keys[pygame.K_SPACE], keys[pygame.K_UP])
+
+
+class IdleInput:
+    """Input source that never presses anything"""
+    def read(self, match):
+        return NO_INPUT
+
+
+class ScriptedInput:
+    """Replay a fixed list of InputState values, then stay idle"""
+    def __init__(self, inputs):
+        self.inputs = list(inputs)
+        self.index = 0
+
+    def read(self, match):
+        if self.index < len(self.inputs):
+            state = self.inputs[self.index]
+            self.index += 1
+            return state
+        return NO_INPUT
+
+
+class ChaseInput:
+    """Simple scripted opponent for benchmarks: run at the ball and head it"""
+    def read(self, match):
+        player = match.player
+        ball = match.ball
+        centre = player.x + player.width / 2
+        near = abs(ball.x - centre) < 40
+        return InputState(ball.x < centre - 10, ball.x > centre + 10,
+                          near and ball.y < player.y, near)
+
+
+class NullRenderer:
+    """Renderer that draws nothing, used for headless runs"""
+    def render(self, match):
+        pass
+
+
+class Match:
+    def __init__(self, player_profile, ai_profile, difficulty, clock=None, player_difficulty=None,
+                 tick_rate=FPS, seed=None, background_planner=False):
+        # Every random decision in the match (AI timing and accuracy, header
+        # jitter) comes from this one stream, so the same seed and the same
+        # inputs always replay the same match.
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.rng = MatchRandom(seed)
+
+        # Game objects, placed exactly where Game.setup_game puts them.
+        # With player_difficulty the left player is also computer-controlled.
+        self.player_is_ai = player_difficulty is not None
+        if self.player_is_ai:
+            self.player = AIOpponent(SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, player_profile,
+                                     difficulty=player_difficulty, rng=self.rng)
+        else:
+            self.player = Player(SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, player_profile, is_player=True)
+        self.ai_opponent = AIOpponent(3 * SCREEN_WIDTH // 4, GROUND_HEIGHT - 100, ai_profile,
+                                      difficulty=difficulty, rng=self.rng)
+        self.ball = Ball(SCREEN_WIDTH // 2, GROUND_HEIGHT - 200, rng=self.rng)
+        self.goal_y = GOAL_AREA_Y
+        
+        # Difficulties with a planner steer the right-hand AI by searching
+        # ahead (search.py) instead of its reactive decisions, either inline
+        # or in a worker process (planner_worker.py)
+        self.planner = None
+        if difficulty.get("planner") == "mcts":
+            if background_planner:
+                from planner_worker import BackgroundPlanner
+                self.planner = BackgroundPlanner({
+                    "player_profile": player_profile, "ai_profile": ai_profile,
+                    "difficulty": difficulty, "player_difficulty": player_difficulty,
+                    "tick_rate": tick_rate, "seed": seed})
+            else:
+                from search import MonteCarloPlanner, reaction_ticks
+                self.planner = MonteCarloPlanner(difficulty, seed=seed,
+                                                 latency=reaction_ticks(difficulty, tick_rate))
+
+        # Score and goal handling
+        self.player_score = 0
+        self.ai_score = 0
+        self.goal_cooldown = 0
+        self.reset_pending = False
+        self.reset_timer = 0
+
+        # Match clock. Without an explicit clock (None), time is derived from
+        # the number of ticks so a headless match lasts GAME_TIME * FPS ticks.
+        self.frame = 0
+        self.tick_rate = tick_rate
+        self.clock = clock
+        self.start_time = clock() if clock is not None else 0
+        self.game_time = GAME_TIME
+        self.finished = False
+        
+        # Forks used for lookahead don't report their goals and kickoffs
+        self.record_events = True
+        if telemetry.level >= telemetry.INFO:
+            telemetry.record(telemetry.KICKOFF, 0, 0)
+
+    def frame_ticks(self):
+        """Milliseconds of simulated time, derived from the tick count"""
+        return self.frame * 1000 // self.tick_rate
+
+    def reset_after_goal(self):
+        """Reset ball and players after a goal"""
+        self.ball.reset(SCREEN_WIDTH // 2, GROUND_HEIGHT - 200)
+        self.player.reset_position()
+        self.ai_opponent.reset_position()
+        if self.record_events and telemetry.level >= telemetry.INFO:
+            telemetry.record(telemetry.KICKOFF, self.player_score, self.ai_score)
+
+    def check_goal(self):
+        """Check if a goal has been scored, returning who scored"""
+        # Skip goal check if on cooldown
+        if self.goal_cooldown > 0:
+            return None
+
+        scorer = None
+        # Left goal (AI scores)
+        if self.ball.x < GOAL_WIDTH and self.goal_y < self.ball.y < self.goal_y + GOAL_HEIGHT:
+            self.ai_score += 1
+            scorer = "ai"
+        # Right goal (Player scores)
+        elif self.ball.x > SCREEN_WIDTH - GOAL_WIDTH and self.goal_y < self.ball.y < self.goal_y + GOAL_HEIGHT:
+            self.player_score += 1
+            scorer = "player"
+
+        if scorer:
+            if self.record_events and telemetry.level >= telemetry.INFO:
+                telemetry.record(telemetry.GOAL, scorer, self.player_score, self.ai_score)
+            # Reset positions after the celebration and block repeat goals
+            self.reset_pending = True
+            self.reset_timer = RESET_DELAY
+            self.goal_cooldown = GOAL_COOLDOWN
+        return scorer
+
+    def apply_input(self, inputs):
+        """Apply one tick of human controls to the player"""
+        # Only move when keys are pressed (not continuous)
+        if inputs.left:
+            self.player.move_left()
+        elif inputs.right:
+            self.player.move_right()
+        else:
+            self.player.stop()
+
+        if inputs.jump:
+            self.player.jump()
+        if inputs.head:
+            if self.player.head():
+                # Check for collision with the ball when heading
+                self.ball.check_player_collision(self.player)
+
+    def step(self, inputs):
+        """Advance the match by one tick. Returns "player"/"ai" when a goal is scored."""
+        if self.finished:
+            return None
+
+        # The planner searches from the state between ticks, the same state
+        # its forks are stepped from, before any of this tick is applied
+        if self.planner is not None:
+            self.ai_opponent.command = self.planner.think(self)
+        self.frame += 1
+
+        # Update goal cooldown
+        if self.goal_cooldown > 0:
+            self.goal_cooldown -= 1
+
+        # Handle reset after goal celebration
+        if self.reset_pending:
+            self.reset_timer -= 1
+            if self.reset_timer <= 0:
+                self.reset_after_goal()
+                self.reset_pending = False
+
+        if self.player_is_ai:
+            # Computer-controlled left player ignores the input source
+            self.player.update(self.ball)
+            self.ball.check_player_collision(self.player)
+        else:
+            self.apply_input(inputs)
+
+        # Update AI and check for collision with the ball
+        self.ai_opponent.update(self.ball)
+        self.ball.check_player_collision(self.ai_opponent)
+
+        self.ball.update()
+        if not self.player_is_ai:
+            self.player.update()
+
+        # Always check for collision with human player (makes it much easier to hit the ball)
+        self.ball.check_player_collision(self.player)
+
+        scorer = self.check_goal()
+
+        # Update match time
+        now = self.frame_ticks() if self.clock is None else self.clock()
+        elapsed = (now - self.start_time) // 1000
+        self.game_time = max(0, GAME_TIME - elapsed)
+
+        # Check for game over
+        if self.game_time <= 0 or self.player_score >= MAX_SCORE or self.ai_score >= MAX_SCORE:
+            self.finished = True
+        return scorer
+
+    def snapshot(self):
+        """Capture the full match state (everything step() reads) as plain values"""
+        return (self.frame, self.player_score, self.ai_score, self.goal_cooldown,
+                self.reset_pending, self.reset_timer, self.game_time, self.finished,
+                self.rng.getstate(), self.ball.snapshot(), self.player.snapshot(),
+                self.ai_opponent.snapshot())
+
+    def restore(self, state):
+        """Restore a state captured by snapshot"""
+        (self.frame, self.player_score, self.ai_score, self.goal_cooldown,
+         self.reset_pending, self.reset_timer, self.game_time, self.finished,
+         rng_state, ball_state, player_state, ai_state) = state
+        self.rng.setstate(rng_state)
+        self.ball.restore(ball_state)
+        self.player.restore(player_state)
+        self.ai_opponent.restore(ai_state)
+
+    def fork(self, into=None):
+        """Independent copy of the match for lookahead.
+
+        The fork has its own ball, players and random stream in the same state
+        as this match, so stepping both with the same inputs gives identical
+        results. Profiles, difficulty and sprites are shared rather than copied,
+        and nothing is deep-copied. Forks have no planner: their AI keeps
+        following its current command until it is given another. Pass an
+        earlier fork of this match as into to reset it to the current state
+        instead of allocating a new one.
+        """
+        if into is not None:
+            state = self.snapshot()
+            into.restore(state[:9] + (self.map_ball_state(state[9], into),) + state[10:])
+            # Commands and last decisions aren't part of the snapshot
+            if self.player_is_ai:
+                into.player.copy_decisions(self.player)
+            into.ai_opponent.copy_decisions(self.ai_opponent)
+            return into
+        
+        match = Match.__new__(Match)
+        match.__dict__.update(self.__dict__)
+        match.rng = rng = MatchRandom.from_state(self.rng.state)
+        match.player = self.player.clone(rng)
+        match.ai_opponent = self.ai_opponent.clone(rng)
+        match.ball = ball = self.ball.clone(rng)
+        last = ball.last_collision_entity
+        if last is not None:
+            ball.last_collision_entity = match.player if last is self.player else match.ai_opponent
+        match.record_events = False
+        match.planner = None
+        return match
+        
+    def close(self):
+        """Stop the planner's worker process, if it has one"""
+        if self.planner is not None:
+            self.planner.close()
+
+    def map_ball_state(self, ball_state, other):
+        """A ball state with its last touched player swapped for other's equivalent"""
+        last = ball_state[5]
+        if last is None:
+            return ball_state
+        last = other.player if last is self.player else other.ai_opponent
+        return ball_state[:5] + (last,) + ball_state[6:]
+        
+    def result(self):
+        """Summary of the match so far"""
+        return {
+            "seed": self.seed,
+            "player_score": self.player_score,
+            "ai_score": self.ai_score,
+            "ticks": self.frame,
+            "seconds": self.frame / self.tick_rate,
+        }
+
+
+def run_match(match, input_source=None, renderer=None, max_ticks=None):
+    """Step a match until it finishes (or max_ticks) and return its result"""
+    input_source = input_source or IdleInput()
+    renderer = renderer or NullRenderer()
+    while not match.finished and (max_ticks is None or match.frame < max_ticks):
+        match.step(input_source.read(match))
+        renderer.render(match)
+    return match.result()
@@ -0,0 +1,146 @@
+"""
+Structured event telemetry for the Head Football game.
+
+Game code records typed events (collisions, headers, jumps, goals, kickoffs)
+into a preallocated ring buffer instead of printing them, and a background
+thread writes them to a file sink as JSON lines. Every call site checks the
+level first, so with telemetry off (the default) an event costs one
+comparison:
+
+    if telemetry.level >= telemetry.DEBUG:
+        telemetry.record(telemetry.JUMP, "ai")
+
+Turn it on with configure(), e.g. `python main.py --telemetry debug`.
+"""
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Levels
+OFF, INFO, DEBUG = 0, 1, 2
+LEVELS = {"off": OFF, "info": INFO, "debug": DEBUG}
+
+# Event types and the fields recorded with each
+COLLISION, HEADER, JUMP, GOAL, KICKOFF, CELEBRATION = range(6)
+EVENTS = {
+    COLLISION: ("collision", ("entity", "part", "vel_x", "vel_y", "force")),
+    HEADER: ("header", ("entity",)),
+    JUMP: ("jump", ("entity",)),
+    GOAL: ("goal", ("scorer", "player_score", "ai_score")),
+    KICKOFF: ("kickoff", ("player_score", "ai_score")),
+    CELEBRATION: ("celebration", ("entity",)),
+}
+
+level = OFF
+
+
+class RingBuffer:
+    """Fixed number of event slots; the oldest unflushed events are overwritten"""
+    def __init__(self, capacity=8192):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0      # events ever written
+        self.tail = 0      # events ever read
+        self.dropped = 0
+
+    def push(self, event):
+        self.slots[self.head % self.capacity] = event
+        self.head += 1
+
+    def drain(self):
+        """Take every event written since the last drain (from the sink thread)"""
+        head = self.head
+        if head - self.tail > self.capacity:
+            # The writer lapped us; those events are gone
+            self.dropped += head - self.tail - self.capacity
+            self.tail = head - self.capacity
+        events = [self.slots[i % self.capacity] for i in range(self.tail, head)]
+        self.tail = head
+        return events
+
+
+def format_event(event):
+    """One JSON line for a recorded (time_ns, type, values) event"""
+    time_ns, event_type, values = event
+    name, fields = EVENTS[event_type]
+    data = {"t_ns": time_ns, "event": name}
+    data.update(zip(fields, values))
+    return json.dumps(data, separators=(",", ":"))
+
+
+class FileSink:
+    """Writes buffered events to a file from a background thread"""
+    def __init__(self, buffer, path, interval=0.25):
+        self.buffer = buffer
+        self.path = path
+        self.interval = interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a")
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        events = self.buffer.drain()
+        if events:
+            self.file.write("\n".join(format_event(event) for event in events) + "\n")
+            self.file.flush()
+
+    def close(self):
+        self.stopping.set()
+        self.thread.join()
+        self.file.close()
+
+
+buffer = RingBuffer()
+sink = None
+
+
+def record(event_type, *values):
+    """Add an event to the ring buffer (check the level before calling)"""
+    buffer.push((time.perf_counter_ns(), event_type, values))
+
+
+def configure(new_level, path=None, capacity=8192, interval=0.25):
+    """Set the level ("off", "info", "debug" or a number) and where events go"""
+    global level, buffer, sink
+    shutdown()
+    level = LEVELS[new_level] if isinstance(new_level, str) else new_level
+    buffer = RingBuffer(capacity)
+    if level > OFF and path:
+        sink = FileSink(buffer, path, interval)
+
+
+@contextlib.contextmanager
+def suspended():
+    """Record nothing inside the block (e.g. while the AI simulates ahead)"""
+    global level
+    saved = level
+    level = OFF
+    try:
+        yield
+    finally:
+        level = saved
+
+
+def shutdown():
+    """Flush and close the file sink, if any"""
+    global sink
+    if sink is not None:
+        sink.close()
+        sink = None
+        if buffer.dropped:
+            print(f"Telemetry dropped {buffer.dropped} events (ring buffer full)")
+
+
+atexit.register(shutdown)
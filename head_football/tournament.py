@@ -0,0 +1,150 @@
+"""
+AI-vs-AI tournament runner for Head Football.
+
+Plays every player profile against every other profile under each
+difficulty level, headless, across a pool of worker processes, and prints
+one aggregated table. Run from the head_football directory:
+    python tournament.py --workers 8 --rounds 4
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from multiprocessing import Pool
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from config import PLAYER_PROFILES, DIFFICULTY_SETTINGS
+from simulation import Match, run_match
+
+
+def build_fixtures(rounds=1, difficulties=None, seed=0):
+    """List every (left, right, difficulty) pairing, repeated for each round"""
+    # Planning difficulties spend milliseconds of search on every tick (and
+    # only steer the right-hand side), so they play only when asked for
+    difficulties = difficulties or [name for name, settings in DIFFICULTY_SETTINGS.items()
+                                    if not settings.get("planner")]
+    fixtures = []
+    for difficulty in difficulties:
+        for left, right in itertools.permutations(PLAYER_PROFILES, 2):
+            for round_index in range(rounds):
+                fixtures.append({
+                    "left": left,
+                    "right": right,
+                    "difficulty": difficulty,
+                    "round": round_index,
+                    "seed": seed + len(fixtures),
+                })
+    return fixtures
+
+
+def play_fixture(fixture):
+    """Play a single AI-vs-AI match and return its result"""
+    # Every match has its own seed, so results don't depend on the worker
+    difficulty = DIFFICULTY_SETTINGS[fixture["difficulty"]]
+    match = Match(PLAYER_PROFILES[fixture["left"]], PLAYER_PROFILES[fixture["right"]],
+                  difficulty, player_difficulty=difficulty, seed=fixture["seed"])
+
+    start = time.perf_counter()
+    result = run_match(match)
+    result.update(fixture)
+    result["wall_seconds"] = time.perf_counter() - start
+    return result
+
+
+class Standings:
+    """Aggregated per-profile results, updated as matches stream in"""
+    def __init__(self):
+        self.rows = {}
+
+    def row(self, difficulty, profile):
+        key = (difficulty, profile)
+        if key not in self.rows:
+            self.rows[key] = {"played": 0, "won": 0, "drawn": 0, "lost": 0,
+                              "goals_for": 0, "goals_against": 0, "seconds": 0.0}
+        return self.rows[key]
+
+    def add(self, result):
+        sides = [(result["left"], result["player_score"], result["ai_score"]),
+                 (result["right"], result["ai_score"], result["player_score"])]
+        for profile, scored, conceded in sides:
+            row = self.row(result["difficulty"], profile)
+            row["played"] += 1
+            row["goals_for"] += scored
+            row["goals_against"] += conceded
+            row["seconds"] += result["seconds"]
+            if scored > conceded:
+                row["won"] += 1
+            elif scored < conceded:
+                row["lost"] += 1
+            else:
+                row["drawn"] += 1
+
+    def format_table(self):
+        lines = [f"{'Difficulty':<10} {'Profile':<10} {'P':>4} {'W':>4} {'D':>4} {'L':>4} "
+                 f"{'GF':>5} {'GA':>5} {'Win%':>6} {'Avg s':>6}"]
+        for difficulty in DIFFICULTY_SETTINGS:
+            ranked = sorted((key for key in self.rows if key[0] == difficulty),
+                            key=lambda key: (-self.rows[key]["won"], key[1]))
+            for key in ranked:
+                row = self.rows[key]
+                win_rate = 100 * row["won"] / row["played"]
+                avg_seconds = row["seconds"] / row["played"]
+                lines.append(f"{difficulty:<10} {key[1]:<10} {row['played']:>4} {row['won']:>4} "
+                             f"{row['drawn']:>4} {row['lost']:>4} {row['goals_for']:>5} "
+                             f"{row['goals_against']:>5} {win_rate:>5.1f}% {avg_seconds:>6.1f}")
+        return "\n".join(lines)
+
+
+def run_tournament(fixtures, workers=None, on_result=None):
+    """Play all fixtures on a process pool, streaming results into Standings"""
+    standings = Standings()
+    with Pool(processes=workers) as pool:
+        for result in pool.imap_unordered(play_fixture, fixtures):
+            standings.add(result)
+            if on_result:
+                on_result(result)
+    return standings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an AI-vs-AI Head Football tournament")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--rounds", type=int, default=1, help="matches per pairing")
+    parser.add_argument("--difficulty", action="append", choices=list(DIFFICULTY_SETTINGS),
+                        help="difficulty level to play (repeatable, default: all without a planner)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the fixtures")
+    parser.add_argument("--csv", help="also write every match result to this CSV file")
+    args = parser.parse_args()
+
+    fixtures = build_fixtures(args.rounds, args.difficulty, args.seed)
+    print(f"Playing {len(fixtures)} matches on {args.workers} workers...")
+
+    results = []
+
+    def on_result(result):
+        results.append(result)
+        print(f"[{len(results)}/{len(fixtures)}] {result['difficulty']}: "
+              f"{result['left']} {result['player_score']} - {result['ai_score']} {result['right']} "
+              f"({result['seconds']:.0f}s)")
+
+    start = time.perf_counter()
+    standings = run_tournament(fixtures, args.workers, on_result)
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(standings.format_table())
+    print(f"\n{len(fixtures)} matches in {elapsed:.1f}s")
+
+    if args.csv:
+        fields = ["difficulty", "left", "right", "round", "seed", "player_score", "ai_score",
+                  "ticks", "seconds", "wall_seconds"]
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == "__main__":
+    main()
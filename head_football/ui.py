@@ -1,13 +1,19 @@
 """
 UI module for the Head Football game.
 """
+import numpy as np
 import pygame
 from config import (
     SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, RED, GREEN, BLUE, SKY_BLUE,
-    PLAYER_PROFILES, DIFFICULTY_SETTINGS, PLAYERS_DIR
+    PLAYER_PROFILES, DIFFICULTY_SETTINGS, PLAYERS_DIR, PREVIEW_SIZE
 )
+from fonts import get_font
+from assets import assets
 import os
 
+# Button and title colour of each difficulty
+DIFFICULTY_COLORS = {"Easy": GREEN, "Medium": BLUE, "Hard": RED, "Expert": (150, 60, 200)}
+
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color, text_color=BLACK, border_radius=10):
         self.rect = pygame.Rect(x, y, width, height)
@@ -52,14 +58,114 @@ class Button:
         self.is_hovered = self.rect.collidepoint(mouse_pos)
         return self.is_hovered and mouse_clicked
 
+class HUDLayer:
+    """In-match HUD that re-renders its text only when the shown values change.
+
+    Each piece (the top band with the player names, the score and the timer)
+    is cached with the values it was rendered from. version goes up whenever
+    any piece is re-rendered, and hits/misses count cache lookups.
+    """
+    def __init__(self, ui):
+        self.ui = ui
+        self.keys = {}
+        self.surfaces = {}
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        
+    def cached(self, name, key, render):
+        """Return the surfaces for name, rendering them again if key changed"""
+        if self.keys.get(name) == key:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.version += 1
+            self.keys[name] = key
+            self.surfaces[name] = render()
+        return self.surfaces[name]
+        
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "version": self.version}
+        
+    def render_band(self):
+        """Compose the HUD background, divider line and player names"""
+        ui = self.ui
+        # Draw HUD background - make it shorter again since timer will be in game field
+        band = pygame.Surface((SCREEN_WIDTH, 62))
+        band.fill(BLACK)
+        pygame.draw.line(band, WHITE, (0, 60), (SCREEN_WIDTH, 60), 2)
+        
+        # Draw player names with team colors - moved to the sides
+        player_name = ui.info_font.render(f"You ({ui.selected_player})", True, WHITE)
+        ai_name = ui.info_font.render(f"AI ({ui.selected_difficulty})", True, WHITE)
+        
+        # Add colored indicators for player sides
+        pygame.draw.rect(band, PLAYER_PROFILES[ui.selected_player]["color"], (10, 30, 5, 20))
+        pygame.draw.rect(band, (255, 50, 50), (SCREEN_WIDTH - 15, 30, 5, 20))  # AI color (red)
+        
+        band.blit(player_name, (20, 30))
+        band.blit(ai_name, (SCREEN_WIDTH - 20 - ai_name.get_width(), 30))
+        return band.convert()
+        
+    def render_score(self, player_score, ai_score):
+        # Score with a shadow for better visibility; it overhangs the band so
+        # both are kept as separate surfaces and blitted straight to the screen
+        score_text = self.ui.title_font.render(f"{player_score} - {ai_score}", True, WHITE)
+        score_shadow = self.ui.title_font.render(f"{player_score} - {ai_score}", True, (50, 50, 50))
+        return score_shadow, score_text
+        
+    def render_timer(self, time_left):
+        minutes = time_left // 60
+        seconds = time_left % 60
+        time_text = self.ui.menu_font.render(f"{minutes:02d}:{seconds:02d}", True, WHITE)
+        time_rect = time_text.get_rect(center=(SCREEN_WIDTH//2, 100))
+        
+        # Semi-transparent background box; reuse the previous one if the size matches
+        size = (time_rect.width + 30, time_rect.height + 10)
+        previous = self.surfaces.get("timer")
+        if previous and previous[0].get_size() == size:
+            timer_surface = previous[0]
+        else:
+            timer_surface = pygame.Surface(size, pygame.SRCALPHA)
+            timer_surface.fill((0, 0, 0, 128))  # Black with 50% transparency
+        return timer_surface, time_text, time_rect
+        
+    def draw(self, screen, player_score, ai_score, time_left):
+        ui = self.ui
+        band = self.cached("band", (ui.selected_player, ui.selected_difficulty), self.render_band)
+        screen.blit(band, (0, 0))
+        
+        # Draw score - centered at the top
+        score_shadow, score_text = self.cached("score", (player_score, ai_score),
+                                               lambda: self.render_score(player_score, ai_score))
+        screen.blit(score_shadow, (SCREEN_WIDTH//2 - score_text.get_width()//2 + 2, 12))
+        screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 10))
+        
+        # Draw time with a semi-transparent box in the game field
+        timer_surface, time_text, time_rect = self.cached("timer", time_left,
+                                                          lambda: self.render_timer(time_left))
+        screen.blit(timer_surface, (time_rect.x - 15, time_rect.y - 5))
+        screen.blit(time_text, time_rect)
+
 class UI:
-    def __init__(self):
-        # Fonts
-        self.title_font = pygame.font.SysFont('Arial', 60, bold=True)
-        self.menu_font = pygame.font.SysFont('Arial', 36)
-        self.button_font = pygame.font.SysFont('Arial', 28)
-        self.info_font = pygame.font.SysFont('Arial', 22)
+    # Fonts are looked up when first drawn, not when the UI is created
+    @property
+    def title_font(self):
+        return get_font('Arial', 60, bold=True)
+        
+    @property
+    def menu_font(self):
+        return get_font('Arial', 36)
+        
+    @property
+    def button_font(self):
+        return get_font('Arial', 28)
+        
+    @property
+    def info_font(self):
+        return get_font('Arial', 22)
         
+    def __init__(self):
         # Menu buttons
         self.menu_buttons = [
             Button(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 - 50, 300, 60, "Play Game", GREEN, (100, 255, 100), WHITE),
@@ -80,7 +186,7 @@ class UI:
         self.difficulty_buttons = []
         y_pos = SCREEN_HEIGHT//2 + 100
         for i, name in enumerate(DIFFICULTY_SETTINGS):
-            color = GREEN if name == "Easy" else BLUE if name == "Medium" else RED
+            color = DIFFICULTY_COLORS.get(name, RED)
             # All text in black now
             text_color = BLACK
             self.difficulty_buttons.append(
@@ -97,20 +203,25 @@ class UI:
         self.selected_player = None
         self.selected_difficulty = None
         
-        # Load player preview images
+        # In-match HUD, re-rendered only when its values change
+        self.hud = HUDLayer(self)
+        
+        # Prerendered menu backgrounds by screen size
+        self.backgrounds = {}
+        
+        # Player preview images, loaded the first time they are shown (usually
+        # the background loader has them ready by then)
         self.player_previews = {}
-        for name, profile in PLAYER_PROFILES.items():
-            sprite_name = profile.get("sprite", None)
+        
+    def get_preview(self, name):
+        """Preview image for a player profile, or None if it has none"""
+        if name not in self.player_previews:
+            sprite_name = PLAYER_PROFILES[name].get("sprite", None)
+            preview = None
             if sprite_name:
-                sprite_path = os.path.join(PLAYERS_DIR, f"{sprite_name}.png")
-                head_path = os.path.join(PLAYERS_DIR, f"{sprite_name}_head.png")
-                try:
-                    if os.path.exists(sprite_path):
-                        sprite = pygame.image.load(sprite_path)
-                        sprite = pygame.transform.scale(sprite, (80, 160))
-                        self.player_previews[name] = sprite
-                except pygame.error:
-                    print(f"Could not load preview for: {sprite_path}")
+                preview = assets.get(os.path.join(PLAYERS_DIR, f"{sprite_name}.png"), PREVIEW_SIZE)
+            self.player_previews[name] = preview
+        return self.player_previews[name]
         
     def draw_menu(self, screen):
         # Draw background
@@ -160,8 +271,8 @@ class UI:
             button.text = original_text
             
             # Draw player preview if available
-            if button.text in self.player_previews:
-                preview = self.player_previews[button.text]
+            preview = self.get_preview(button.text)
+            if preview:
                 preview_x = button.rect.x + (button.rect.width - preview.get_width()) // 2
                 preview_y = button.rect.y - 100
                 screen.blit(preview, (preview_x, preview_y))
@@ -230,6 +341,17 @@ class UI:
             return continue_button
         return None
         
+    def layout_difficulty_buttons(self):
+        """Space the difficulty buttons equally, narrowing them if they don't fit"""
+        count = len(self.difficulty_buttons)
+        button_width = min(180, (SCREEN_WIDTH - 120 - (count - 1) * 30) // count)
+        total_width = count * button_width + (count - 1) * 30  # 30px spacing
+        start_x = (SCREEN_WIDTH - total_width) // 2
+        for i, button in enumerate(self.difficulty_buttons):
+            button.rect.width = button_width
+            button.rect.x = start_x + i * (button_width + 30)
+            button.rect.y = SCREEN_HEIGHT//2 - 50
+        
     def draw_difficulty_select(self, screen):
         # Draw background
         self.draw_background(screen)
@@ -242,8 +364,8 @@ class UI:
             profile = PLAYER_PROFILES[self.selected_player]
             
             # Draw player preview
-            if self.selected_player in self.player_previews:
-                preview = self.player_previews[self.selected_player]
+            preview = self.get_preview(self.selected_player)
+            if preview:
                 preview_x = 100
                 preview_y = SCREEN_HEIGHT//2 - 200
                 screen.blit(preview, (preview_x, preview_y))
@@ -259,17 +381,9 @@ class UI:
         pygame.draw.rect(screen, (240, 240, 240), selection_bg, border_radius=15)
         pygame.draw.rect(screen, BLACK, selection_bg, 2, border_radius=15)
         
-        # Calculate equal spacing for difficulty buttons
-        button_width = 180
-        total_width = len(self.difficulty_buttons) * button_width + (len(self.difficulty_buttons) - 1) * 30  # 30px spacing
-        start_x = (SCREEN_WIDTH - total_width) // 2
-        
         # Draw difficulty buttons with equal spacing
-        for i, button in enumerate(self.difficulty_buttons):
-            # Update button position for equal spacing
-            button.rect.x = start_x + i * (button_width + 30)
-            button.rect.y = SCREEN_HEIGHT//2 - 50
-            
+        self.layout_difficulty_buttons()
+        for button in self.difficulty_buttons:
             # Update selected state
             button.selected = (button.text == self.selected_difficulty)
             button.draw(screen, self.button_font)
@@ -292,6 +406,11 @@ class UI:
                 desc = "Balanced AI with moderate reactions and accuracy."
                 desc2 = "Recommended for casual players."
                 color = BLUE
+            elif self.selected_difficulty == "Expert":
+                title = "Expert Mode"
+                desc = "AI that plans its moves by simulating the match ahead."
+                desc2 = "For players who find Hard too easy."
+                color = DIFFICULTY_COLORS["Expert"]
             else:  # Hard
                 title = "Hard Mode"
                 desc = "Fast AI with quick reactions and high accuracy."
@@ -322,42 +441,22 @@ class UI:
         return None, back_button
             
     def draw_game_hud(self, screen, player_score, ai_score, time_left):
-        # Draw HUD background - make it shorter again since timer will be in game field
-        hud_rect = pygame.Rect(0, 0, SCREEN_WIDTH, 60)
-        pygame.draw.rect(screen, (0, 0, 0, 128), hud_rect)
-        pygame.draw.line(screen, WHITE, (0, 60), (SCREEN_WIDTH, 60), 2)
-        
-        # Draw score with shadow effect - centered at the top
-        score_text = self.title_font.render(f"{player_score} - {ai_score}", True, WHITE)
-        # Add shadow for better visibility
-        score_shadow = self.title_font.render(f"{player_score} - {ai_score}", True, (50, 50, 50))
-        screen.blit(score_shadow, (SCREEN_WIDTH//2 - score_text.get_width()//2 + 2, 12))
-        screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 10))
-        
-        # Draw player names with team colors - moved to the sides
-        player_name = self.info_font.render(f"You ({self.selected_player})", True, WHITE)
-        ai_name = self.info_font.render(f"AI ({self.selected_difficulty})", True, WHITE)
-        
-        # Add colored indicators for player sides
-        pygame.draw.rect(screen, PLAYER_PROFILES[self.selected_player]["color"], (10, 30, 5, 20))
-        pygame.draw.rect(screen, (255, 50, 50), (SCREEN_WIDTH - 15, 30, 5, 20))  # AI color (red)
-        
-        screen.blit(player_name, (20, 30))
-        screen.blit(ai_name, (SCREEN_WIDTH - 20 - ai_name.get_width(), 30))
-        
-        # Draw time with a semi-transparent box in the game field
-        minutes = time_left // 60
-        seconds = time_left % 60
-        time_text = self.menu_font.render(f"{minutes:02d}:{seconds:02d}", True, WHITE)
-        time_rect = time_text.get_rect(center=(SCREEN_WIDTH//2, 100))
-        
-        # Create a semi-transparent surface for the timer background
-        timer_surface = pygame.Surface((time_rect.width + 30, time_rect.height + 10), pygame.SRCALPHA)
-        timer_surface.fill((0, 0, 0, 128))  # Black with 50% transparency
-        
-        # Draw the timer background and text
-        screen.blit(timer_surface, (time_rect.x - 15, time_rect.y - 5))
-        screen.blit(time_text, time_rect)
+        self.hud.draw(screen, player_score, ai_score, time_left)
+        
+    def hud_rects(self):
+        """Screen areas drawn by draw_game_hud"""
+        return [pygame.Rect(0, 0, SCREEN_WIDTH, 62), pygame.Rect(SCREEN_WIDTH//2 - 100, 62, 200, 70)]
+        
+    def draw_loading_bar(self, screen, progress):
+        """Thin progress bar just above the credits footer"""
+        bar = pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT - 40, 300, 8)
+        pygame.draw.rect(screen, BLACK, bar.inflate(4, 4), border_radius=4)
+        filled = bar.copy()
+        filled.width = int(bar.width * progress)
+        if filled.width:
+            pygame.draw.rect(screen, WHITE, filled, border_radius=4)
+        label = self.info_font.render(f"Loading {int(progress * 100)}%", True, WHITE)
+        screen.blit(label, (bar.centerx - label.get_width()//2, bar.y - label.get_height() - 4))
         
     def draw_game_over(self, screen, player_score, ai_score):
         # Draw semi-transparent overlay
@@ -462,15 +561,9 @@ class UI:
         if event.type == pygame.MOUSEMOTION:
             mouse_pos = pygame.mouse.get_pos()
             
-            # Calculate equal spacing for difficulty buttons
-            button_width = 180
-            total_width = len(self.difficulty_buttons) * button_width + (len(self.difficulty_buttons) - 1) * 30  # 30px spacing
-            start_x = (SCREEN_WIDTH - total_width) // 2
-            
             # Update difficulty button positions
-            for i, button in enumerate(self.difficulty_buttons):
-                button.rect.x = start_x + i * (button_width + 30)
-                button.rect.y = SCREEN_HEIGHT//2 - 50
+            self.layout_difficulty_buttons()
+            for button in self.difficulty_buttons:
                 button.check_hover(mouse_pos)
                 
             # Check back button
@@ -515,20 +608,38 @@ class UI:
                     return i  # Return button index
         return -1
         
-    def draw_background(self, screen):
-        # Draw gradient background
-        for y in range(0, SCREEN_HEIGHT, 2):
-            color_value = int(200 - y / SCREEN_HEIGHT * 100)
-            color = (color_value, color_value + 30, 255)
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
-            
+    def render_background(self, width, height):
+        """Build the menu background once for a screen size"""
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        
+        # Gradient on every other scanline; the rows in between stay
+        # transparent so whatever is behind shows through
+        rows = np.arange(0, height, 2)
+        values = (200 - rows / height * 100).astype(np.int32)
+        pixels = pygame.surfarray.pixels3d(background)
+        pixels[:, rows, 0] = values
+        pixels[:, rows, 1] = values + 30
+        pixels[:, rows, 2] = 255
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(background)
+        alpha[:, rows] = 255
+        del alpha
+        
         # Draw ground
-        pygame.draw.rect(screen, (34, 139, 34), 
-                        (0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 100))
+        pygame.draw.rect(background, (34, 139, 34), 
+                        (0, height - 100, width, 100))
                         
         # Draw decorative elements
-        pygame.draw.circle(screen, WHITE, (100, 100), 40, 2)
-        pygame.draw.circle(screen, WHITE, (SCREEN_WIDTH - 100, 100), 40, 2)
+        pygame.draw.circle(background, WHITE, (100, 100), 40, 2)
+        pygame.draw.circle(background, WHITE, (width - 100, 100), 40, 2)
+        return background.convert_alpha()
+        
+    def draw_background(self, screen):
+        # The background only depends on the screen size, so build it once
+        size = screen.get_size()
+        if size not in self.backgrounds:
+            self.backgrounds[size] = self.render_background(*size)
+        screen.blit(self.backgrounds[size], (0, 0))
         
     def draw_title(self, screen, text, x, y):
         # Draw shadow